@@ -1,17 +1,28 @@
-from typing import Annotated, Dict, Any, List, Optional
+import base64
+import binascii
+from datetime import datetime
+from typing import Annotated, Awaitable, Callable, Dict, Any, List, Optional, Tuple, Type, TypeVar
+from uuid import UUID
+
+import msgspec
 import redis.asyncio as redis
 
-from fastapi import Depends, HTTPException, status, Query
+from fastapi import Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.common.config import get_settings
 from src.common.database import get_db
-from src.common.auth import get_current_user, get_current_user_with_permissions
+from src.common.auth import (
+    AuthUser, CurrentUser, get_current_admin_user, get_current_user,
+    get_current_user_with_permissions, optional_oauth2_scheme
+)
 from src.modules.auth.persistence.user_repository import UserRepository
 from src.modules.identity.persistence.profile_repository import ProfileRepository
 
 settings = get_settings()
 
+StructT = TypeVar("StructT", bound=msgspec.Struct)
+
 # Redis connection pool
 _redis_client = None
 
@@ -26,15 +37,38 @@ async def get_redis_client():
         )
     return _redis_client
 
+# Request body parsing
+def msgspec_body(struct_type: Type[StructT]) -> Callable[[Request], Awaitable[StructT]]:
+    """
+    Build a dependency that decodes the JSON request body into a msgspec Struct.
+    
+    The decoder is created once per struct type, so each request only pays for
+    a single validate-and-decode pass. Malformed or invalid bodies are rejected
+    with a 422, matching FastAPI's behaviour for Pydantic bodies.
+    """
+    decoder = msgspec.json.Decoder(struct_type)
+    
+    async def parse_body(request: Request) -> StructT:
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+    
+    return parse_body
+
 # Authentication and authorization dependencies
 async def get_optional_current_user(
-    token: Optional[str] = None,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
     db: AsyncSession = Depends(get_db)
-) -> Optional[Dict[str, Any]]:
+) -> Optional[CurrentUser]:
     """
     Get the current user if authenticated, or None if not.
     This is useful for endpoints that work with both authenticated
-    and unauthenticated users.
+    and unauthenticated users. Requests without a bearer token return
+    before any token decoding or user lookup.
     """
     if not token:
         return None
@@ -60,6 +94,24 @@ async def get_admin_user(
     
     return current_user
 
+async def require_admin(
+    _: CurrentUser = Depends(get_current_admin_user),
+    current_user: AuthUser = Depends(get_current_user_with_permissions)
+) -> AuthUser:
+    """
+    Get current user as an AuthUser if they have the admin role.
+    
+    The role check is get_current_admin_user's, backed by the authorization
+    service's cached role lookup, so there is one admin mechanism throughout.
+    """
+    return current_user
+
+async def is_admin_flag(
+    current_user: AuthUser = Depends(get_current_user_with_permissions)
+) -> bool:
+    """Whether the current user has the admin role."""
+    return "admin" in current_user.roles
+
 async def get_instructor_user(
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -99,6 +151,40 @@ class PaginationParams:
             "total_pages": total_pages
         }
 
+def encode_cursor(created_at: datetime, item_id: Any) -> str:
+    """
+    Encode a keyset pagination cursor for the last row of a page.
+
+    Args:
+        created_at: Creation time of the last row
+        item_id: ID of the last row
+
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+class CursorParams:
+    """Keyset pagination parameters for list endpoints ordered by (created_at, id) descending."""
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+        limit: int = Query(100, ge=1, le=100, description="Number of items per page")
+    ):
+        self.limit = limit
+        self.after: Optional[Tuple[datetime, UUID]] = None
+        
+        if cursor:
+            try:
+                created_at, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+                self.after = (datetime.fromisoformat(created_at), UUID(item_id))
+            except (binascii.Error, UnicodeDecodeError, ValueError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid pagination cursor"
+                )
+
 class SortParams:
     """Sorting parameters for list endpoints."""
     def __init__(
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from src.common.database import get_db
+from src.common.database import get_db, get_pool_status
 from src.common.auth import get_current_admin_user
 from src.modules.admin.services.dashboard_service import DashboardService
 
@@ -264,3 +264,14 @@ async def get_subscriptions_timeseries(
             ) for point in time_series
         ]
     )
+
+@router.get("/pool")
+async def get_database_pool_status(
+    current_user: Dict[str, Any] = Depends(get_current_admin_user)
+):
+    """
+    Get database connection pool status.
+    
+    Returns current pool usage, for spotting pool exhaustion under load.
+    """
+    return get_pool_status()
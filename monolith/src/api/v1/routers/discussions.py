@@ -1,17 +1,50 @@
-from typing import List, Optional, Dict, Any
+from typing import Annotated, List, Optional, Dict, Any
 from uuid import UUID
+import operator
 
+import msgspec
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from src.common.database import get_db
 from src.common.auth import get_current_user
+from src.api.v1.dependencies import msgspec_body
 from src.modules.discussion.services.discussion_service import DiscussionService
 from src.modules.discussion.services.moderation_service import ModerationService
 
 router = APIRouter(prefix="/discussions", tags=["Discussions"])
 
+# Validation constants and prebuilt error responses. Raising a shared
+# HTTPException instance avoids rebuilding the detail string and exception
+# object on every rejected request; ``with_traceback(None)`` keeps the
+# traceback from accumulating across raises.
+_ITEM_TYPES = ("course", "video", "assessment", "learning_path", "general")
+_ITEM_TYPES_MSG = f"Invalid item type. Must be one of: {', '.join(_ITEM_TYPES)}"
+_DISCUSSION_SORT_OPTIONS = ("recent", "popular", "unanswered")
+_COMMENT_SORT_OPTIONS = ("recent", "popular")
+
+_ERR_INVALID_ITEM_TYPE = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail=_ITEM_TYPES_MSG
+)
+_ERR_INVALID_DISCUSSION_SORT = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail=f"Invalid sort option. Must be one of: {', '.join(_DISCUSSION_SORT_OPTIONS)}"
+)
+_ERR_INVALID_COMMENT_SORT = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail=f"Invalid sort option. Must be one of: {', '.join(_COMMENT_SORT_OPTIONS)}"
+)
+_ERR_ITEM_ID_REQUIRED = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="item_id is required for non-general discussions"
+)
+_ERR_CONTENT_VIOLATION = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Content violates community guidelines"
+)
+
 # Request/Response Models
 class UserInfo(BaseModel):
     """User info model."""
@@ -26,9 +59,9 @@ class CommentBase(BaseModel):
     """Base comment model."""
     content: str = Field(..., min_length=1, max_length=5000)
 
-class CommentCreateRequest(CommentBase):
+class CommentCreateRequest(msgspec.Struct):
     """Comment creation request model."""
-    pass
+    content: Annotated[str, msgspec.Meta(min_length=1, max_length=5000)]
 
 class CommentUpdateRequest(CommentBase):
     """Comment update request model."""
@@ -54,9 +87,13 @@ class DiscussionBase(BaseModel):
     content: str = Field(..., min_length=10, max_length=10000)
     tags: List[str] = Field(default_factory=list)
 
-class DiscussionCreateRequest(DiscussionBase):
+class DiscussionCreateRequest(msgspec.Struct):
     """Discussion creation request model."""
-    item_type: str = Field(..., description="Type of item: 'course', 'video', 'assessment', 'learning_path', 'general'")
+    title: Annotated[str, msgspec.Meta(min_length=3, max_length=200)]
+    content: Annotated[str, msgspec.Meta(min_length=10, max_length=10000)]
+    # Type of item: 'course', 'video', 'assessment', 'learning_path', 'general'
+    item_type: str
+    tags: List[str] = msgspec.field(default_factory=list)
     item_id: Optional[UUID] = None  # Optional for general discussions
 
 class DiscussionUpdateRequest(BaseModel):
@@ -83,18 +120,123 @@ class DiscussionResponse(DiscussionBase):
     class Config:
         from_attributes = True
 
-class VoteRequest(BaseModel):
+class VoteRequest(msgspec.Struct):
     """Vote request model."""
-    vote: int = Field(..., ge=-1, le=1)  # -1 for downvote, 0 for no vote, 1 for upvote
+    vote: Annotated[int, msgspec.Meta(ge=-1, le=1)]  # -1 for downvote, 0 for no vote, 1 for upvote
 
-class ReportRequest(BaseModel):
+class ReportRequest(msgspec.Struct):
     """Report request model."""
-    reason: str = Field(..., min_length=10, max_length=1000)
+    reason: Annotated[str, msgspec.Meta(min_length=10, max_length=1000)]
+
+# Response serializers
+# Attribute getters are bound once at import time so list endpoints fetch every
+# field of a row in a single C-level call instead of N attribute lookups.
+_author_fields = operator.attrgetter("id", "first_name", "last_name", "avatar_url")
+_discussion_fields = operator.attrgetter(
+    "id", "title", "content", "tags", "created_at", "updated_at", "author",
+    "item_type", "item_id", "upvotes", "downvotes", "comment_count",
+    "is_pinned", "is_approved", "user_vote"
+)
+_comment_fields = operator.attrgetter(
+    "id", "content", "created_at", "updated_at", "author",
+    "upvotes", "downvotes", "is_approved", "user_vote"
+)
+
+def _serialize_author(author: Any) -> Dict[str, Any]:
+    """Build the UserInfo payload for a discussion or comment author."""
+    author_id, first_name, last_name, avatar_url = _author_fields(author)
+    return {
+        "id": author_id,
+        "name": f"{first_name} {last_name}",
+        "avatar_url": avatar_url
+    }
+
+def _serialize_discussion(discussion: Any) -> Dict[str, Any]:
+    """Build the DiscussionResponse payload for a discussion."""
+    (
+        discussion_id, title, content, tags, created_at, updated_at, author,
+        item_type, item_id, upvotes, downvotes, comment_count,
+        is_pinned, is_approved, user_vote
+    ) = _discussion_fields(discussion)
+    return {
+        "id": discussion_id,
+        "title": title,
+        "content": content,
+        "tags": tags,
+        "created_at": created_at.isoformat(),
+        "updated_at": updated_at.isoformat(),
+        "author": _serialize_author(author),
+        "item_type": item_type,
+        "item_id": item_id,
+        "upvotes": upvotes,
+        "downvotes": downvotes,
+        "comment_count": comment_count,
+        "is_pinned": is_pinned,
+        "is_approved": is_approved,
+        "user_vote": user_vote
+    }
+
+# Flat row shape returned by DiscussionService.list_discussions_raw, which
+# selects discussion and author columns directly instead of ORM instances.
+_discussion_row_fields = operator.itemgetter(
+    "id", "title", "content", "tags", "created_at", "updated_at",
+    "author_id", "author_first_name", "author_last_name", "author_avatar_url",
+    "item_type", "item_id", "upvotes", "downvotes", "comment_count",
+    "is_pinned", "is_approved", "user_vote"
+)
+
+def _serialize_discussion_row(row: Any) -> Dict[str, Any]:
+    """Build the DiscussionResponse payload for a discussion row mapping."""
+    (
+        discussion_id, title, content, tags, created_at, updated_at,
+        author_id, first_name, last_name, avatar_url,
+        item_type, item_id, upvotes, downvotes, comment_count,
+        is_pinned, is_approved, user_vote
+    ) = _discussion_row_fields(row)
+    return {
+        "id": discussion_id,
+        "title": title,
+        "content": content,
+        "tags": tags,
+        "created_at": created_at.isoformat(),
+        "updated_at": updated_at.isoformat(),
+        "author": {
+            "id": author_id,
+            "name": f"{first_name} {last_name}",
+            "avatar_url": avatar_url
+        },
+        "item_type": item_type,
+        "item_id": item_id,
+        "upvotes": upvotes,
+        "downvotes": downvotes,
+        "comment_count": comment_count,
+        "is_pinned": is_pinned,
+        "is_approved": is_approved,
+        "user_vote": user_vote
+    }
+
+def _serialize_comment(comment: Any) -> Dict[str, Any]:
+    """Build the CommentResponse payload for a comment."""
+    (
+        comment_id, content, created_at, updated_at, author,
+        upvotes, downvotes, is_approved, user_vote
+    ) = _comment_fields(comment)
+    return {
+        "id": comment_id,
+        "content": content,
+        "created_at": created_at.isoformat(),
+        "updated_at": updated_at.isoformat(),
+        "author": _serialize_author(author),
+        "upvotes": upvotes,
+        "downvotes": downvotes,
+        "is_approved": is_approved,
+        "user_vote": user_vote
+    }
 
 # Routes
 @router.post("", response_model=DiscussionResponse, status_code=status.HTTP_201_CREATED)
 async def create_discussion(
-    discussion_data: DiscussionCreateRequest,
+    discussion_data: DiscussionCreateRequest = Depends(msgspec_body(DiscussionCreateRequest)),
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -106,18 +248,11 @@ async def create_discussion(
     discussion_service = DiscussionService(db)
     
     # Validate item_type and item_id combination
-    valid_item_types = ["course", "video", "assessment", "learning_path", "general"]
-    if discussion_data.item_type not in valid_item_types:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid item type. Must be one of: {', '.join(valid_item_types)}"
-        )
+    if discussion_data.item_type not in _ITEM_TYPES:
+        raise _ERR_INVALID_ITEM_TYPE.with_traceback(None)
     
     if discussion_data.item_type != "general" and discussion_data.item_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="item_id is required for non-general discussions"
-        )
+        raise _ERR_ITEM_ID_REQUIRED.with_traceback(None)
     
     # Apply content moderation
     moderation_service = ModerationService(db)
@@ -127,10 +262,7 @@ async def create_discussion(
     )
     
     if not is_content_allowed:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Content violates community guidelines"
-        )
+        raise _ERR_CONTENT_VIOLATION.with_traceback(None)
     
     try:
         discussion = await discussion_service.create_discussion(
@@ -142,27 +274,7 @@ async def create_discussion(
             author_id=UUID(current_user["sub"])
         )
         
-        return DiscussionResponse(
-            id=discussion.id,
-            title=discussion.title,
-            content=discussion.content,
-            tags=discussion.tags,
-            created_at=discussion.created_at.isoformat(),
-            updated_at=discussion.updated_at.isoformat(),
-            author=UserInfo(
-                id=discussion.author.id,
-                name=f"{discussion.author.first_name} {discussion.author.last_name}",
-                avatar_url=discussion.author.avatar_url
-            ),
-            item_type=discussion.item_type,
-            item_id=discussion.item_id,
-            upvotes=discussion.upvotes,
-            downvotes=discussion.downvotes,
-            comment_count=discussion.comment_count,
-            is_pinned=discussion.is_pinned,
-            is_approved=discussion.is_approved,
-            user_vote=discussion.user_vote
-        )
+        return _serialize_discussion(discussion)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -189,26 +301,19 @@ async def list_discussions(
     discussion_service = DiscussionService(db)
     
     # Validate item_type
-    if item_type is not None:
-        valid_item_types = ["course", "video", "assessment", "learning_path", "general"]
-        if item_type not in valid_item_types:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid item type. Must be one of: {', '.join(valid_item_types)}"
-            )
+    if item_type is not None and item_type not in _ITEM_TYPES:
+        raise _ERR_INVALID_ITEM_TYPE.with_traceback(None)
     
     # Validate sort_by
-    valid_sort_options = ["recent", "popular", "unanswered"]
-    if sort_by not in valid_sort_options:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid sort option. Must be one of: {', '.join(valid_sort_options)}"
-        )
+    if sort_by not in _DISCUSSION_SORT_OPTIONS:
+        raise _ERR_INVALID_DISCUSSION_SORT.with_traceback(None)
     
     # Get user ID if authenticated
     user_id = UUID(current_user["sub"]) if current_user else None
     
-    discussions = await discussion_service.list_discussions(
+    # Core select returning RowMappings; skips ORM materialization of every
+    # discussion and its joined author.
+    discussions = await discussion_service.list_discussions_raw(
         item_type=item_type,
         item_id=item_id,
         tag=tag,
@@ -220,27 +325,7 @@ async def list_discussions(
     )
     
     return [
-        DiscussionResponse(
-            id=discussion.id,
-            title=discussion.title,
-            content=discussion.content,
-            tags=discussion.tags,
-            created_at=discussion.created_at.isoformat(),
-            updated_at=discussion.updated_at.isoformat(),
-            author=UserInfo(
-                id=discussion.author.id,
-                name=f"{discussion.author.first_name} {discussion.author.last_name}",
-                avatar_url=discussion.author.avatar_url
-            ),
-            item_type=discussion.item_type,
-            item_id=discussion.item_id,
-            upvotes=discussion.upvotes,
-            downvotes=discussion.downvotes,
-            comment_count=discussion.comment_count,
-            is_pinned=discussion.is_pinned,
-            is_approved=discussion.is_approved,
-            user_vote=discussion.user_vote
-        ) for discussion in discussions
+        _serialize_discussion_row(discussion) for discussion in discussions
     ]
 
 @router.get("/{discussion_id}", response_model=DiscussionResponse)
@@ -270,27 +355,7 @@ async def get_discussion(
             detail="Discussion not found"
         )
     
-    return DiscussionResponse(
-        id=discussion.id,
-        title=discussion.title,
-        content=discussion.content,
-        tags=discussion.tags,
-        created_at=discussion.created_at.isoformat(),
-        updated_at=discussion.updated_at.isoformat(),
-        author=UserInfo(
-            id=discussion.author.id,
-            name=f"{discussion.author.first_name} {discussion.author.last_name}",
-            avatar_url=discussion.author.avatar_url
-        ),
-        item_type=discussion.item_type,
-        item_id=discussion.item_id,
-        upvotes=discussion.upvotes,
-        downvotes=discussion.downvotes,
-        comment_count=discussion.comment_count,
-        is_pinned=discussion.is_pinned,
-        is_approved=discussion.is_approved,
-        user_vote=discussion.user_vote
-    )
+    return _serialize_discussion(discussion)
 
 @router.put("/{discussion_id}", response_model=DiscussionResponse)
 async def update_discussion(
@@ -333,10 +398,7 @@ async def update_discussion(
         )
         
         if not is_content_allowed:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Content violates community guidelines"
-            )
+            raise _ERR_CONTENT_VIOLATION.with_traceback(None)
     
     try:
         updated_discussion = await discussion_service.update_discussion(
@@ -347,27 +409,7 @@ async def update_discussion(
             updated_by=UUID(current_user["sub"])
         )
         
-        return DiscussionResponse(
-            id=updated_discussion.id,
-            title=updated_discussion.title,
-            content=updated_discussion.content,
-            tags=updated_discussion.tags,
-            created_at=updated_discussion.created_at.isoformat(),
-            updated_at=updated_discussion.updated_at.isoformat(),
-            author=UserInfo(
-                id=updated_discussion.author.id,
-                name=f"{updated_discussion.author.first_name} {updated_discussion.author.last_name}",
-                avatar_url=updated_discussion.author.avatar_url
-            ),
-            item_type=updated_discussion.item_type,
-            item_id=updated_discussion.item_id,
-            upvotes=updated_discussion.upvotes,
-            downvotes=updated_discussion.downvotes,
-            comment_count=updated_discussion.comment_count,
-            is_pinned=updated_discussion.is_pinned,
-            is_approved=updated_discussion.is_approved,
-            user_vote=updated_discussion.user_vote
-        )
+        return _serialize_discussion(updated_discussion)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -420,7 +462,7 @@ async def delete_discussion(
 
 @router.post("/{discussion_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 async def create_comment(
-    comment_data: CommentCreateRequest,
+    comment_data: CommentCreateRequest = Depends(msgspec_body(CommentCreateRequest)),
     discussion_id: UUID = Path(..., description="The ID of the discussion to comment on"),
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -452,10 +494,7 @@ async def create_comment(
     )
     
     if not is_content_allowed:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Content violates community guidelines"
-        )
+        raise _ERR_CONTENT_VIOLATION.with_traceback(None)
     
     try:
         comment = await discussion_service.create_comment(
@@ -464,21 +503,7 @@ async def create_comment(
             author_id=UUID(current_user["sub"])
         )
         
-        return CommentResponse(
-            id=comment.id,
-            content=comment.content,
-            created_at=comment.created_at.isoformat(),
-            updated_at=comment.updated_at.isoformat(),
-            author=UserInfo(
-                id=comment.author.id,
-                name=f"{comment.author.first_name} {comment.author.last_name}",
-                avatar_url=comment.author.avatar_url
-            ),
-            upvotes=comment.upvotes,
-            downvotes=comment.downvotes,
-            is_approved=comment.is_approved,
-            user_vote=comment.user_vote
-        )
+        return _serialize_comment(comment)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -514,12 +539,8 @@ async def list_comments(
         )
     
     # Validate sort_by
-    valid_sort_options = ["recent", "popular"]
-    if sort_by not in valid_sort_options:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid sort option. Must be one of: {', '.join(valid_sort_options)}"
-        )
+    if sort_by not in _COMMENT_SORT_OPTIONS:
+        raise _ERR_INVALID_COMMENT_SORT.with_traceback(None)
     
     # Get user ID if authenticated
     user_id = UUID(current_user["sub"]) if current_user else None
@@ -533,21 +554,7 @@ async def list_comments(
     )
     
     return [
-        CommentResponse(
-            id=comment.id,
-            content=comment.content,
-            created_at=comment.created_at.isoformat(),
-            updated_at=comment.updated_at.isoformat(),
-            author=UserInfo(
-                id=comment.author.id,
-                name=f"{comment.author.first_name} {comment.author.last_name}",
-                avatar_url=comment.author.avatar_url
-            ),
-            upvotes=comment.upvotes,
-            downvotes=comment.downvotes,
-            is_approved=comment.is_approved,
-            user_vote=comment.user_vote
-        ) for comment in comments
+        _serialize_comment(comment) for comment in comments
     ]
 
 @router.put("/{discussion_id}/comments/{comment_id}", response_model=CommentResponse)
@@ -591,10 +598,7 @@ async def update_comment(
     )
     
     if not is_content_allowed:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Content violates community guidelines"
-        )
+        raise _ERR_CONTENT_VIOLATION.with_traceback(None)
     
     try:
         updated_comment = await discussion_service.update_comment(
@@ -603,21 +607,7 @@ async def update_comment(
             updated_by=UUID(current_user["sub"])
         )
         
-        return CommentResponse(
-            id=updated_comment.id,
-            content=updated_comment.content,
-            created_at=updated_comment.created_at.isoformat(),
-            updated_at=updated_comment.updated_at.isoformat(),
-            author=UserInfo(
-                id=updated_comment.author.id,
-                name=f"{updated_comment.author.first_name} {updated_comment.author.last_name}",
-                avatar_url=updated_comment.author.avatar_url
-            ),
-            upvotes=updated_comment.upvotes,
-            downvotes=updated_comment.downvotes,
-            is_approved=updated_comment.is_approved,
-            user_vote=updated_comment.user_vote
-        )
+        return _serialize_comment(updated_comment)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -671,7 +661,7 @@ async def delete_comment(
 
 @router.post("/{discussion_id}/vote", status_code=status.HTTP_204_NO_CONTENT)
 async def vote_discussion(
-    vote_data: VoteRequest,
+    vote_data: VoteRequest = Depends(msgspec_body(VoteRequest)),
     discussion_id: UUID = Path(..., description="The ID of the discussion to vote on"),
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -698,7 +688,7 @@ async def vote_discussion(
 
 @router.post("/{discussion_id}/comments/{comment_id}/vote", status_code=status.HTTP_204_NO_CONTENT)
 async def vote_comment(
-    vote_data: VoteRequest,
+    vote_data: VoteRequest = Depends(msgspec_body(VoteRequest)),
     discussion_id: UUID = Path(..., description="The ID of the discussion"),
     comment_id: UUID = Path(..., description="The ID of the comment to vote on"),
     current_user: Dict[str, Any] = Depends(get_current_user),
@@ -726,7 +716,7 @@ async def vote_comment(
 
 @router.post("/{discussion_id}/report", status_code=status.HTTP_204_NO_CONTENT)
 async def report_discussion(
-    report_data: ReportRequest,
+    report_data: ReportRequest = Depends(msgspec_body(ReportRequest)),
     discussion_id: UUID = Path(..., description="The ID of the discussion to report"),
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -754,7 +744,7 @@ async def report_discussion(
 
 @router.post("/{discussion_id}/comments/{comment_id}/report", status_code=status.HTTP_204_NO_CONTENT)
 async def report_comment(
-    report_data: ReportRequest,
+    report_data: ReportRequest = Depends(msgspec_body(ReportRequest)),
     discussion_id: UUID = Path(..., description="The ID of the discussion"),
     comment_id: UUID = Path(..., description="The ID of the comment to report"),
     current_user: Dict[str, Any] = Depends(get_current_user),
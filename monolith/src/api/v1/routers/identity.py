@@ -1,16 +1,46 @@
+from datetime import datetime
 from typing import Dict, Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Body, Path, Query
+from fastapi_cache.decorator import cache
 from pydantic import BaseModel, validator, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.common.database import get_db
-from src.common.auth import get_current_user, get_current_user_with_permissions
+from src.common.auth import AuthUser, get_auth_user, get_current_user_with_permissions
+from src.common.responses import ORJSONResponse, etag_matches, not_modified, weak_etag
 from src.api.v1.dependencies import get_admin_user
+from src.modules.identity.domain.profile import UserProfile
 from src.modules.identity.services.user_profile_service import UserProfileService
 from src.modules.identity.services.authorization_service import AuthorizationService
 
-router = APIRouter(prefix="/identity", tags=["Identity"])
+router = APIRouter(prefix="/identity", tags=["Identity"], default_response_class=ORJSONResponse)
+
+# Service dependencies, built once per request from the request's session
+def get_profile_service(db: AsyncSession = Depends(get_db)) -> UserProfileService:
+    """Get the user profile service for the current request."""
+    return UserProfileService(db)
+
+def get_authorization_service(db: AsyncSession = Depends(get_db)) -> AuthorizationService:
+    """Get the authorization service for the current request."""
+    return AuthorizationService(db)
+
+# Response cache for the (near-static) role/permission listing. Clear it with
+# FastAPICache.clear(namespace=ROLES_ALL_CACHE_NAMESPACE) whenever roles or
+# their permissions change.
+ROLES_ALL_CACHE_NAMESPACE = "roles_all"
+ROLES_ALL_CACHE_TTL_SECONDS = 300
+
+def _roles_all_cache_key(func, namespace: str = "", *args, **kwargs) -> str:
+    """
+    Cache key for get_all_roles.
+    
+    The response does not depend on the caller, so the key ignores the
+    request arguments (the admin user and the database session). The
+    namespace passed in already carries the global prefix, and the key stays
+    under it so FastAPICache.clear(namespace=...) removes it.
+    """
+    return f"{namespace}:all"
 
 # Request/Response Models
 class ProfileResponse(BaseModel):
@@ -25,8 +55,8 @@ class ProfileResponse(BaseModel):
     location: Optional[str] = None
     social_links: Optional[Dict[str, str]] = None
     preferences: Optional[Dict[str, Any]] = None
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
 class UpdateProfileRequest(BaseModel):
     """Update profile request model."""
@@ -82,21 +112,38 @@ class AssignRoleRequest(BaseModel):
     """Assign role request model."""
     role_code: str = Field(..., description="Role code to assign")
 
+def _profile_response(profile: UserProfile) -> ProfileResponse:
+    """Build a ProfileResponse, keeping timestamps as datetimes for orjson to encode."""
+    return ProfileResponse.model_construct(
+        id=profile.id,
+        user_id=profile.user_id,
+        bio=profile.bio,
+        avatar_url=profile.avatar_url,
+        title=profile.title,
+        company=profile.company,
+        website=profile.website,
+        location=profile.location,
+        social_links=profile.social_links,
+        preferences=profile.preferences,
+        created_at=profile.created_at,
+        updated_at=profile.updated_at
+    )
+
 # Routes
-@router.get("/profile", response_model=ProfileResponse)
+@router.get("/profile", responses={200: {"model": ProfileResponse}})
 async def get_own_profile(
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: AuthUser = Depends(get_auth_user),
+    profile_service: UserProfileService = Depends(get_profile_service)
 ):
     """
     Get the current user's profile.
     
     Returns profile information for the authenticated user.
     """
-    profile_service = UserProfileService(db)
-    
     # Get or create profile
-    profile = await profile_service.get_or_create_profile(current_user["id"])
+    profile = await profile_service.get_or_create_profile(current_user.id)
     
     if not profile:
         raise HTTPException(
@@ -104,25 +151,28 @@ async def get_own_profile(
             detail="Profile not found"
         )
     
-    profile_dict = profile.to_dict()
-    return ProfileResponse(**profile_dict)
+    # Skip serialization when the client's cached copy is still current
+    etag = weak_etag(profile.id, profile.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
+    return _profile_response(profile)
 
-@router.put("/profile", response_model=ProfileResponse)
+@router.put("/profile", responses={200: {"model": ProfileResponse}})
 async def update_own_profile(
     data: UpdateProfileRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: AuthUser = Depends(get_auth_user),
+    profile_service: UserProfileService = Depends(get_profile_service)
 ):
     """
     Update the current user's profile.
     
     Updates profile information for the authenticated user.
     """
-    profile_service = UserProfileService(db)
-    
     try:
         profile = await profile_service.update_profile(
-            user_id=current_user["id"],
+            user_id=current_user.id,
             bio=data.bio,
             avatar_url=data.avatar_url,
             title=data.title,
@@ -132,8 +182,7 @@ async def update_own_profile(
             social_links=data.social_links
         )
         
-        profile_dict = profile.to_dict()
-        return ProfileResponse(**profile_dict)
+        return _profile_response(profile)
         
     except ValueError as e:
         raise HTTPException(
@@ -141,28 +190,25 @@ async def update_own_profile(
             detail=str(e)
         )
 
-@router.put("/profile/preferences", response_model=ProfileResponse)
+@router.put("/profile/preferences", responses={200: {"model": ProfileResponse}})
 async def update_preference(
     data: UpdatePreferenceRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: AuthUser = Depends(get_auth_user),
+    profile_service: UserProfileService = Depends(get_profile_service)
 ):
     """
     Update a single user preference.
     
     Updates a specific preference for the authenticated user.
     """
-    profile_service = UserProfileService(db)
-    
     try:
         profile = await profile_service.update_preference(
-            user_id=current_user["id"],
+            user_id=current_user.id,
             key=data.key,
             value=data.value
         )
         
-        profile_dict = profile.to_dict()
-        return ProfileResponse(**profile_dict)
+        return _profile_response(profile)
         
     except ValueError as e:
         raise HTTPException(
@@ -170,11 +216,11 @@ async def update_preference(
             detail=str(e)
         )
 
-@router.get("/profile/{user_id}", response_model=ProfileResponse)
+@router.get("/profile/{user_id}", responses={200: {"model": ProfileResponse}})
 async def get_user_profile(
     user_id: str = Path(..., description="User ID"),
-    current_user: Dict[str, Any] = Depends(get_current_user_with_permissions),
-    db: AsyncSession = Depends(get_db)
+    current_user: AuthUser = Depends(get_current_user_with_permissions),
+    profile_service: UserProfileService = Depends(get_profile_service)
 ):
     """
     Get profile for a specific user.
@@ -182,21 +228,16 @@ async def get_user_profile(
     Requires the requesting user to be an admin or the profile owner.
     """
     # Check if user is admin or requesting their own profile
-    if current_user["id"] != user_id:
-        # Verify permission to view other profiles
-        auth_service = AuthorizationService(db)
-        has_permission = await auth_service.check_permission(
-            user_id=current_user["id"],
-            permission_code="identity.view_profile"
+    if (
+        current_user.id != user_id
+        and not current_user.is_admin
+        and "identity.view_profile" not in current_user.permissions
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this profile"
         )
-        
-        if not has_permission:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to view this profile"
-            )
     
-    profile_service = UserProfileService(db)
     profile = await profile_service.get_profile(user_id)
     
     if not profile:
@@ -205,24 +246,22 @@ async def get_user_profile(
             detail="Profile not found"
         )
     
-    profile_dict = profile.to_dict()
-    return ProfileResponse(**profile_dict)
+    return _profile_response(profile)
 
-@router.get("/roles", response_model=List[RoleResponse])
+@router.get("/roles", responses={200: {"model": List[RoleResponse]}})
 async def get_user_roles(
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: AuthUser = Depends(get_auth_user),
+    auth_service: AuthorizationService = Depends(get_authorization_service)
 ):
     """
     Get roles for the current user.
     
     Returns a list of roles assigned to the authenticated user.
     """
-    auth_service = AuthorizationService(db)
-    roles = await auth_service.get_user_roles(current_user["id"])
+    roles = await auth_service.get_user_roles(current_user.id)
     
     return [
-        RoleResponse(
+        RoleResponse.model_construct(
             id=role.id,
             code=role.code,
             name=role.name,
@@ -231,27 +270,32 @@ async def get_user_roles(
         for role in roles
     ]
 
-@router.get("/roles/all", response_model=List[RoleWithPermissionsResponse])
+@router.get("/roles/all", responses={200: {"model": List[RoleWithPermissionsResponse]}})
+@cache(
+    expire=ROLES_ALL_CACHE_TTL_SECONDS,
+    namespace=ROLES_ALL_CACHE_NAMESPACE,
+    key_builder=_roles_all_cache_key
+)
 async def get_all_roles(
     admin_user: Dict[str, Any] = Depends(get_admin_user),
-    db: AsyncSession = Depends(get_db)
+    auth_service: AuthorizationService = Depends(get_authorization_service)
 ):
     """
     Get all roles with their permissions.
     
-    Admin-only endpoint to get all roles in the system.
+    Admin-only endpoint to get all roles in the system. The admin check runs
+    on every request; only the role listing itself is served from cache.
     """
-    auth_service = AuthorizationService(db)
     roles = await auth_service.get_all_roles()
     
     return [
-        RoleWithPermissionsResponse(
+        RoleWithPermissionsResponse.model_construct(
             id=role.id,
             code=role.code,
             name=role.name,
             description=role.description,
             permissions=[
-                PermissionResponse(
+                PermissionResponse.model_construct(
                     id=perm.id,
                     code=perm.code,
                     name=perm.name,
@@ -268,15 +312,13 @@ async def assign_role_to_user(
     data: AssignRoleRequest,
     user_id: str = Path(..., description="User ID"),
     admin_user: Dict[str, Any] = Depends(get_admin_user),
-    db: AsyncSession = Depends(get_db)
+    auth_service: AuthorizationService = Depends(get_authorization_service)
 ):
     """
     Assign a role to a user.
     
     Admin-only endpoint to assign a role to a user.
     """
-    auth_service = AuthorizationService(db)
-    
     try:
         success = await auth_service.assign_role_to_user(
             user_id=user_id,
@@ -289,7 +331,7 @@ async def assign_role_to_user(
                 detail="Failed to assign role"
             )
         
-        return None
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
         
     except ValueError as e:
         raise HTTPException(
@@ -302,15 +344,13 @@ async def remove_role_from_user(
     user_id: str = Path(..., description="User ID"),
     role_code: str = Path(..., description="Role code"),
     admin_user: Dict[str, Any] = Depends(get_admin_user),
-    db: AsyncSession = Depends(get_db)
+    auth_service: AuthorizationService = Depends(get_authorization_service)
 ):
     """
     Remove a role from a user.
     
     Admin-only endpoint to remove a role from a user.
     """
-    auth_service = AuthorizationService(db)
-    
     try:
         success = await auth_service.remove_role_from_user(
             user_id=user_id,
@@ -323,7 +363,7 @@ async def remove_role_from_user(
                 detail="Failed to remove role"
             )
         
-        return None
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
         
     except ValueError as e:
         raise HTTPException(
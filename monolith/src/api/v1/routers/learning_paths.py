@@ -1,22 +1,38 @@
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Literal, Optional, Dict, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from src.common.database import get_db
-from src.common.auth import get_current_user
+from src.common.auth import AuthUser, get_auth_user
+from src.common.responses import ORJSONResponse, etag_matches, not_modified, weak_etag
+from src.api.v1.dependencies import CursorParams, encode_cursor, require_admin, is_admin_flag
 from src.modules.learning_path.services.learning_path_service import LearningPathService
 from src.modules.learning_path.services.enrollment_service import EnrollmentService
 
-router = APIRouter(prefix="/learning-paths", tags=["Learning Paths"])
+router = APIRouter(prefix="/learning-paths", tags=["Learning Paths"], default_response_class=ORJSONResponse)
+
+# Service dependencies, built once per request from the request's session
+def get_path_service(db: AsyncSession = Depends(get_db)) -> LearningPathService:
+    """Get the learning path service for the current request."""
+    return LearningPathService(db)
+
+def get_enrollment_service(db: AsyncSession = Depends(get_db)) -> EnrollmentService:
+    """Get the enrollment service for the current request."""
+    return EnrollmentService(db)
+
+# Allowed values, validated by Pydantic before any handler or DB work runs
+DifficultyLevel = Literal["beginner", "intermediate", "advanced"]
+PathItemType = Literal["course", "assessment", "content"]
 
 # Request/Response Models
 class PathItemBase(BaseModel):
     """Base learning path item model."""
     order: int
-    item_type: str = Field(..., description="Type of item: 'course', 'assessment', 'content'")
+    item_type: PathItemType = Field(..., description="Type of item: 'course', 'assessment', 'content'")
     item_id: UUID
     required: bool = True
     
@@ -37,7 +53,7 @@ class LearningPathBase(BaseModel):
     """Base learning path model."""
     title: str
     description: str
-    difficulty_level: str = Field(..., description="Difficulty level: 'beginner', 'intermediate', 'advanced'")
+    difficulty_level: DifficultyLevel = Field(..., description="Difficulty level: 'beginner', 'intermediate', 'advanced'")
     estimated_hours: Optional[int] = None
     is_featured: bool = False
     category: Optional[str] = None
@@ -51,7 +67,7 @@ class LearningPathUpdateRequest(BaseModel):
     """Learning path update request model."""
     title: Optional[str] = None
     description: Optional[str] = None
-    difficulty_level: Optional[str] = None
+    difficulty_level: Optional[DifficultyLevel] = None
     estimated_hours: Optional[int] = None
     is_featured: Optional[bool] = None
     category: Optional[str] = None
@@ -61,8 +77,8 @@ class LearningPathUpdateRequest(BaseModel):
 class LearningPathResponse(LearningPathBase):
     """Learning path response model."""
     id: UUID
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
     total_items: int
     items: List[PathItemResponse]
     
@@ -78,7 +94,7 @@ class EnrollmentResponse(BaseModel):
     id: UUID
     learning_path_id: UUID
     user_id: UUID
-    enrolled_at: str
+    enrolled_at: datetime
     status: str
     completion_percentage: int
     
@@ -90,20 +106,51 @@ class ProgressUpdateRequest(BaseModel):
     item_id: UUID
     completed: bool
 
+# Response serializers
+def _serialize_path(path: Any) -> Dict[str, Any]:
+    """Build the LearningPathResponse payload for a learning path and its items."""
+    items = path.items
+    return {
+        "id": path.id,
+        "title": path.title,
+        "description": path.description,
+        "difficulty_level": path.difficulty_level,
+        "estimated_hours": path.estimated_hours,
+        "is_featured": path.is_featured,
+        "category": path.category,
+        "is_published": path.is_published,
+        "created_at": path.created_at,
+        "updated_at": path.updated_at,
+        "total_items": len(items),
+        "items": [
+            {
+                "id": item.id,
+                "order": item.order,
+                "item_type": item.item_type,
+                "item_id": item.item_id,
+                "required": item.required,
+                "title": item.title,
+                "description": item.description
+            } for item in items
+        ]
+    }
+
 # Routes
-@router.post("", response_model=LearningPathResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": LearningPathResponse}}
+)
 async def create_learning_path(
     path_data: LearningPathCreateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: AuthUser = Depends(get_auth_user),
+    learning_path_service: LearningPathService = Depends(get_path_service)
 ):
     """
     Create a new learning path.
     
     Creates a new learning path with optional items.
     """
-    learning_path_service = LearningPathService(db)
-    
     try:
         learning_path = await learning_path_service.create_learning_path(
             title=path_data.title,
@@ -114,34 +161,12 @@ async def create_learning_path(
             category=path_data.category,
             is_published=path_data.is_published,
             items=path_data.items,
-            created_by=UUID(current_user["sub"])
+            created_by=current_user.sub_uuid
         )
         
-        items_response = [
-            PathItemResponse(
-                id=item.id,
-                order=item.order,
-                item_type=item.item_type,
-                item_id=item.item_id,
-                required=item.required,
-                title=item.title,
-                description=item.description
-            ) for item in learning_path.items
-        ]
-        
-        return LearningPathResponse(
-            id=learning_path.id,
-            title=learning_path.title,
-            description=learning_path.description,
-            difficulty_level=learning_path.difficulty_level,
-            estimated_hours=learning_path.estimated_hours,
-            is_featured=learning_path.is_featured,
-            category=learning_path.category,
-            is_published=learning_path.is_published,
-            created_at=learning_path.created_at.isoformat(),
-            updated_at=learning_path.updated_at.isoformat(),
-            total_items=len(learning_path.items),
-            items=items_response
+        return ORJSONResponse(
+            _serialize_path(learning_path),
+            status_code=status.HTTP_201_CREATED
         )
     except ValueError as e:
         raise HTTPException(
@@ -149,80 +174,54 @@ async def create_learning_path(
             detail=str(e)
         )
 
-@router.get("", response_model=List[LearningPathResponse])
+@router.get("", responses={200: {"model": List[LearningPathResponse]}})
 async def list_learning_paths(
     category: Optional[str] = Query(None, description="Filter by category"),
-    difficulty_level: Optional[str] = Query(None, description="Filter by difficulty level"),
+    difficulty_level: Optional[DifficultyLevel] = Query(None, description="Filter by difficulty level"),
     featured_only: bool = Query(False, description="Filter by featured status"),
-    limit: int = Query(100, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    current_user: Optional[Dict[str, Any]] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    pagination: CursorParams = Depends(),
+    is_admin: bool = Depends(is_admin_flag),
+    learning_path_service: LearningPathService = Depends(get_path_service)
 ):
     """
     List learning paths.
     
-    Returns a list of learning paths, optionally filtered by various criteria.
+    Returns a page of learning paths, newest first, optionally filtered by
+    various criteria. When more results exist, the cursor for the next page
+    is returned in the X-Next-Cursor header.
     """
-    learning_path_service = LearningPathService(db)
-    
-    # Non-admins can only see published paths
-    is_admin = False
-    if current_user and "is_admin" in current_user and current_user["is_admin"]:
-        is_admin = True
-        
+    # Non-admins can only see published paths. Paging is keyset-based on
+    # (created_at, id) so late pages cost the same as the first one.
     learning_paths = await learning_path_service.list_learning_paths(
         category=category,
         difficulty_level=difficulty_level,
         featured_only=featured_only,
         published_only=not is_admin,
-        limit=limit,
-        offset=offset
+        limit=pagination.limit,
+        after=pagination.after,
+        # Load path items in one batched IN-query rather than lazily per path
+        load_items=True
     )
     
-    result = []
-    for path in learning_paths:
-        items_response = [
-            PathItemResponse(
-                id=item.id,
-                order=item.order,
-                item_type=item.item_type,
-                item_id=item.item_id,
-                required=item.required,
-                title=item.title,
-                description=item.description
-            ) for item in path.items
-        ]
-        
-        result.append(LearningPathResponse(
-            id=path.id,
-            title=path.title,
-            description=path.description,
-            difficulty_level=path.difficulty_level,
-            estimated_hours=path.estimated_hours,
-            is_featured=path.is_featured,
-            category=path.category,
-            is_published=path.is_published,
-            created_at=path.created_at.isoformat(),
-            updated_at=path.updated_at.isoformat(),
-            total_items=len(path.items),
-            items=items_response
-        ))
+    headers = {}
+    if len(learning_paths) == pagination.limit:
+        last = learning_paths[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
     
-    return result
+    return ORJSONResponse([_serialize_path(path) for path in learning_paths], headers=headers)
 
-@router.get("/{path_id}", response_model=LearningPathResponse)
+@router.get("/{path_id}", responses={200: {"model": LearningPathResponse}})
 async def get_learning_path(
+    request: Request,
     path_id: UUID = Path(..., description="The ID of the learning path to retrieve"),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    is_admin: bool = Depends(is_admin_flag),
+    learning_path_service: LearningPathService = Depends(get_path_service)
 ):
     """
     Get a specific learning path by ID.
     
     Returns the learning path data with its items.
     """
-    learning_path_service = LearningPathService(db)
     learning_path = await learning_path_service.get_learning_path(path_id)
     
     if not learning_path:
@@ -232,68 +231,31 @@ async def get_learning_path(
         )
     
     # Non-admins can only see published paths
-    is_admin = False
-    if "is_admin" in current_user and current_user["is_admin"]:
-        is_admin = True
-        
     if not is_admin and not learning_path.is_published:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Learning path not found"
         )
     
-    items_response = [
-        PathItemResponse(
-            id=item.id,
-            order=item.order,
-            item_type=item.item_type,
-            item_id=item.item_id,
-            required=item.required,
-            title=item.title,
-            description=item.description
-        ) for item in learning_path.items
-    ]
+    # Skip serialization when the client's cached copy is still current
+    etag = weak_etag(learning_path.id, learning_path.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    return LearningPathResponse(
-        id=learning_path.id,
-        title=learning_path.title,
-        description=learning_path.description,
-        difficulty_level=learning_path.difficulty_level,
-        estimated_hours=learning_path.estimated_hours,
-        is_featured=learning_path.is_featured,
-        category=learning_path.category,
-        is_published=learning_path.is_published,
-        created_at=learning_path.created_at.isoformat(),
-        updated_at=learning_path.updated_at.isoformat(),
-        total_items=len(learning_path.items),
-        items=items_response
-    )
+    return ORJSONResponse(_serialize_path(learning_path), headers={"ETag": etag})
 
-@router.put("/{path_id}", response_model=LearningPathResponse)
+@router.put("/{path_id}", responses={200: {"model": LearningPathResponse}})
 async def update_learning_path(
     path_data: LearningPathUpdateRequest,
     path_id: UUID = Path(..., description="The ID of the learning path to update"),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    admin_user: AuthUser = Depends(require_admin),
+    learning_path_service: LearningPathService = Depends(get_path_service)
 ):
     """
     Update a learning path.
     
     Updates an existing learning path with new data.
     """
-    # Check if user is an admin
-    is_admin = False
-    if "is_admin" in current_user and current_user["is_admin"]:
-        is_admin = True
-        
-    if not is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can update learning paths"
-        )
-    
-    learning_path_service = LearningPathService(db)
-    
     try:
         learning_path = await learning_path_service.update_learning_path(
             path_id=path_id,
@@ -305,7 +267,7 @@ async def update_learning_path(
             category=path_data.category,
             is_published=path_data.is_published,
             items=path_data.items,
-            updated_by=UUID(current_user["sub"])
+            updated_by=admin_user.sub_uuid
         )
         
         if not learning_path:
@@ -314,32 +276,7 @@ async def update_learning_path(
                 detail="Learning path not found"
             )
         
-        items_response = [
-            PathItemResponse(
-                id=item.id,
-                order=item.order,
-                item_type=item.item_type,
-                item_id=item.item_id,
-                required=item.required,
-                title=item.title,
-                description=item.description
-            ) for item in learning_path.items
-        ]
-        
-        return LearningPathResponse(
-            id=learning_path.id,
-            title=learning_path.title,
-            description=learning_path.description,
-            difficulty_level=learning_path.difficulty_level,
-            estimated_hours=learning_path.estimated_hours,
-            is_featured=learning_path.is_featured,
-            category=learning_path.category,
-            is_published=learning_path.is_published,
-            created_at=learning_path.created_at.isoformat(),
-            updated_at=learning_path.updated_at.isoformat(),
-            total_items=len(learning_path.items),
-            items=items_response
-        )
+        return ORJSONResponse(_serialize_path(learning_path))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -349,29 +286,17 @@ async def update_learning_path(
 @router.delete("/{path_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_learning_path(
     path_id: UUID = Path(..., description="The ID of the learning path to delete"),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    admin_user: AuthUser = Depends(require_admin),
+    learning_path_service: LearningPathService = Depends(get_path_service)
 ):
     """
     Delete a learning path.
     
     Removes a learning path and its associated items.
     """
-    # Check if user is an admin
-    is_admin = False
-    if "is_admin" in current_user and current_user["is_admin"]:
-        is_admin = True
-        
-    if not is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can delete learning paths"
-        )
-    
-    learning_path_service = LearningPathService(db)
     success = await learning_path_service.delete_learning_path(
         path_id=path_id,
-        deleted_by=UUID(current_user["sub"])
+        deleted_by=admin_user.sub_uuid
     )
     
     if not success:
@@ -380,22 +305,24 @@ async def delete_learning_path(
             detail="Learning path not found"
         )
     
-    return None
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
-@router.post("/enroll", response_model=EnrollmentResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/enroll",
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": EnrollmentResponse}}
+)
 async def enroll_in_learning_path(
     enrollment_data: EnrollmentRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: AuthUser = Depends(get_auth_user),
+    enrollment_service: EnrollmentService = Depends(get_enrollment_service),
+    learning_path_service: LearningPathService = Depends(get_path_service)
 ):
     """
     Enroll in a learning path.
     
     Enrolls the current user in a learning path.
     """
-    enrollment_service = EnrollmentService(db)
-    learning_path_service = LearningPathService(db)
-    
     # Check if learning path exists and is published
     learning_path = await learning_path_service.get_learning_path(enrollment_data.learning_path_id)
     if not learning_path:
@@ -412,15 +339,15 @@ async def enroll_in_learning_path(
     
     try:
         enrollment = await enrollment_service.enroll_user(
-            user_id=UUID(current_user["sub"]),
+            user_id=current_user.sub_uuid,
             learning_path_id=enrollment_data.learning_path_id
         )
         
-        return EnrollmentResponse(
+        return EnrollmentResponse.model_construct(
             id=enrollment.id,
             learning_path_id=enrollment.learning_path_id,
             user_id=enrollment.user_id,
-            enrolled_at=enrollment.enrolled_at.isoformat(),
+            enrolled_at=enrollment.enrolled_at,
             status=enrollment.status,
             completion_percentage=enrollment.completion_percentage
         )
@@ -430,27 +357,26 @@ async def enroll_in_learning_path(
             detail=str(e)
         )
 
-@router.get("/enrollments", response_model=List[EnrollmentResponse])
+@router.get("/enrollments", responses={200: {"model": List[EnrollmentResponse]}})
 async def list_user_enrollments(
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: AuthUser = Depends(get_auth_user),
+    enrollment_service: EnrollmentService = Depends(get_enrollment_service)
 ):
     """
     List user enrollments.
     
     Returns a list of learning paths that the current user is enrolled in.
     """
-    enrollment_service = EnrollmentService(db)
     enrollments = await enrollment_service.list_user_enrollments(
-        user_id=UUID(current_user["sub"])
+        user_id=current_user.sub_uuid
     )
     
     return [
-        EnrollmentResponse(
+        EnrollmentResponse.model_construct(
             id=enrollment.id,
             learning_path_id=enrollment.learning_path_id,
             user_id=enrollment.user_id,
-            enrolled_at=enrollment.enrolled_at.isoformat(),
+            enrolled_at=enrollment.enrolled_at,
             status=enrollment.status,
             completion_percentage=enrollment.completion_percentage
         ) for enrollment in enrollments
@@ -459,23 +385,21 @@ async def list_user_enrollments(
 @router.put("/progress", status_code=status.HTTP_204_NO_CONTENT)
 async def update_learning_path_progress(
     progress_data: ProgressUpdateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: AuthUser = Depends(get_auth_user),
+    enrollment_service: EnrollmentService = Depends(get_enrollment_service)
 ):
     """
     Update learning path progress.
     
     Updates the current user's progress on a learning path item.
     """
-    enrollment_service = EnrollmentService(db)
-    
     try:
         await enrollment_service.update_progress(
-            user_id=UUID(current_user["sub"]),
+            user_id=current_user.sub_uuid,
             item_id=progress_data.item_id,
             completed=progress_data.completed
         )
-        return None
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
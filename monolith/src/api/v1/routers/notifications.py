@@ -1,42 +1,67 @@
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+import orjson
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query, Path
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator
 
 from src.common.database import get_db
-from src.common.auth import get_current_user
+from src.common.auth import CurrentUser, get_current_user
+from src.common.cache import cached_response, invalidate_cache, set_cached
 from src.modules.notification.services.notification_service import NotificationService
 from src.modules.notification.services.preference_service import PreferenceService
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
+# Badge counts are polled frequently; cache them briefly per user and drop
+# the entry whenever the user's notifications change
+NOTIFICATION_COUNT_CACHE_TTL_SECONDS = 5
+
+def _count_cache_key(user_id: str) -> str:
+    return f"notifcount:{user_id}"
+
+# Notification IDs are only passed through to SQL, where asyncpg binds them to
+# the uuid column; a pattern check is enough and skips UUID object parsing
+_UUID_PATTERN = r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+
+# Dependency to get NotificationService
+def get_notification_service(db: AsyncSession = Depends(get_db)) -> NotificationService:
+    return NotificationService(db)
+
+# Dependency to get PreferenceService
+def get_preference_service(db: AsyncSession = Depends(get_db)) -> PreferenceService:
+    return PreferenceService(db)
+
 # Request/Response Models
 class Notification(BaseModel):
     """Notification model."""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: UUID
     user_id: UUID
     title: str
     message: str
     type: str
     is_read: bool
-    created_at: str
+    created_at: datetime
     related_entity_type: Optional[str] = None
     related_entity_id: Optional[UUID] = None
     
-    class Config:
-        from_attributes = True
+    @field_serializer("created_at")
+    def serialize_created_at(self, created_at: datetime) -> str:
+        return created_at.isoformat()
 
 class NotificationPreference(BaseModel):
     """Notification preference model."""
+    model_config = ConfigDict(from_attributes=True)
+    
     type: str
     email_enabled: bool
     push_enabled: bool
     in_app_enabled: bool
-    
-    class Config:
-        from_attributes = True
 
 class NotificationPreferenceUpdate(BaseModel):
     """Notification preference update model."""
@@ -46,7 +71,12 @@ class NotificationPreferenceUpdate(BaseModel):
 
 class BatchMarkReadRequest(BaseModel):
     """Batch mark notifications as read request model."""
-    notification_ids: List[UUID]
+    notification_ids: List[UUID] = Field(..., max_length=500)
+    
+    @field_validator("notification_ids")
+    @classmethod
+    def dedupe_notification_ids(cls, notification_ids: List[UUID]) -> List[UUID]:
+        return list(dict.fromkeys(notification_ids))
 
 class NotificationCountResponse(BaseModel):
     """Notification count response model."""
@@ -56,54 +86,64 @@ class NotificationCountResponse(BaseModel):
 # Routes
 @router.get("", response_model=List[Notification])
 async def list_notifications(
+    response: Response,
     is_read: Optional[bool] = Query(None, description="Filter by read status"),
     type: Optional[str] = Query(None, description="Filter by notification type"),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    before: Optional[datetime] = Query(None, description="Only return notifications created before this time (created_at of the last item on the previous page)"),
+    current_user: CurrentUser = Depends(get_current_user),
+    notification_service: NotificationService = Depends(get_notification_service)
 ):
     """
     List notifications.
     
-    Returns a list of notifications for the user, optionally filtered by read status or type.
+    Returns a page of notifications for the user, newest first, optionally
+    filtered by read status or type. Pages are keyset-based: pass the
+    created_at of the last notification as `before` to get the next page.
+    The X-Total-Count and X-Unread-Count headers carry the counts of the
+    matching notifications.
     """
-    notification_service = NotificationService(db)
-    notifications = await notification_service.list_notifications(
-        user_id=UUID(current_user["sub"]),
+    # Rows plus total/unread window counts (COUNT(*) OVER ()) in one query
+    notifications, total, unread = await notification_service.list_notifications(
+        user_id=current_user["sub_uuid"],
         is_read=is_read,
         type=type,
         limit=limit,
-        offset=offset
+        before=before
     )
     
-    return [
-        Notification(
-            id=notification.id,
-            user_id=notification.user_id,
-            title=notification.title,
-            message=notification.message,
-            type=notification.type,
-            is_read=notification.is_read,
-            created_at=notification.created_at.isoformat(),
-            related_entity_type=notification.related_entity_type,
-            related_entity_id=notification.related_entity_id
-        ) for notification in notifications
-    ]
+    response.headers["X-Total-Count"] = str(total)
+    response.headers["X-Unread-Count"] = str(unread)
+    
+    # An unfiltered first page counts everything, so it can also refresh the
+    # badge count cache
+    if is_read is None and type is None and before is None:
+        await set_cached(
+            _count_cache_key(current_user["sub"]),
+            orjson.dumps({"total": total, "unread": unread}),
+            NOTIFICATION_COUNT_CACHE_TTL_SECONDS
+        )
+    
+    # response_model validates the ORM rows directly (from_attributes)
+    return notifications
 
 @router.get("/count", response_model=NotificationCountResponse)
+@cached_response(
+    ttl=NOTIFICATION_COUNT_CACHE_TTL_SECONDS,
+    key=lambda current_user, **_: _count_cache_key(current_user["sub"])
+)
 async def count_notifications(
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    notification_service: NotificationService = Depends(get_notification_service)
 ):
     """
     Count notifications.
     
     Returns the total and unread notification counts for the user.
     """
-    notification_service = NotificationService(db)
     counts = await notification_service.count_notifications(
-        user_id=UUID(current_user["sub"])
+        user_id=current_user["sub_uuid"]
     )
     
     return NotificationCountResponse(
@@ -113,20 +153,19 @@ async def count_notifications(
 
 @router.put("/{notification_id}/read", response_model=Notification)
 async def mark_as_read(
-    notification_id: UUID = Path(..., description="The ID of the notification to mark as read"),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    notification_id: str = Path(..., pattern=_UUID_PATTERN, description="The ID of the notification to mark as read"),
+    current_user: CurrentUser = Depends(get_current_user),
+    notification_service: NotificationService = Depends(get_notification_service)
 ):
     """
     Mark a notification as read.
     
     Updates a specific notification to mark it as read.
     """
-    notification_service = NotificationService(db)
-    
-    # Check if notification exists and belongs to user
-    notification = await notification_service.get_notification(
-        user_id=UUID(current_user["sub"]),
+    # Single UPDATE ... WHERE id AND user_id RETURNING; marking an already
+    # read notification is a no-op that still returns it
+    notification = await notification_service.mark_as_read(
+        user_id=current_user["sub_uuid"],
         notification_id=notification_id
     )
     
@@ -136,103 +175,64 @@ async def mark_as_read(
             detail="Notification not found"
         )
     
-    # No need to update if already read
-    if notification.is_read:
-        return Notification(
-            id=notification.id,
-            user_id=notification.user_id,
-            title=notification.title,
-            message=notification.message,
-            type=notification.type,
-            is_read=notification.is_read,
-            created_at=notification.created_at.isoformat(),
-            related_entity_type=notification.related_entity_type,
-            related_entity_id=notification.related_entity_id
-        )
-    
-    updated_notification = await notification_service.mark_as_read(
-        notification_id=notification_id
-    )
+    await invalidate_cache(_count_cache_key(current_user["sub"]))
     
-    return Notification(
-        id=updated_notification.id,
-        user_id=updated_notification.user_id,
-        title=updated_notification.title,
-        message=updated_notification.message,
-        type=updated_notification.type,
-        is_read=updated_notification.is_read,
-        created_at=updated_notification.created_at.isoformat(),
-        related_entity_type=updated_notification.related_entity_type,
-        related_entity_id=updated_notification.related_entity_id
-    )
+    return notification
 
 @router.put("/batch-mark-read", status_code=status.HTTP_204_NO_CONTENT)
 async def batch_mark_as_read(
     data: BatchMarkReadRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    notification_service: NotificationService = Depends(get_notification_service)
 ):
     """
     Mark multiple notifications as read.
     
     Updates multiple notifications to mark them as read.
     """
-    notification_service = NotificationService(db)
-    
     if not data.notification_ids:
         return None
     
     await notification_service.batch_mark_as_read(
-        user_id=UUID(current_user["sub"]),
+        user_id=current_user["sub_uuid"],
         notification_ids=data.notification_ids
     )
+    await invalidate_cache(_count_cache_key(current_user["sub"]))
     
     return None
 
 @router.put("/mark-all-read", status_code=status.HTTP_204_NO_CONTENT)
 async def mark_all_as_read(
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    notification_service: NotificationService = Depends(get_notification_service)
 ):
     """
     Mark all notifications as read.
     
     Updates all unread notifications for the user to mark them as read.
     """
-    notification_service = NotificationService(db)
-    
     await notification_service.mark_all_as_read(
-        user_id=UUID(current_user["sub"])
+        user_id=current_user["sub_uuid"]
     )
+    await invalidate_cache(_count_cache_key(current_user["sub"]))
     
     return None
 
 @router.delete("/{notification_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_notification(
-    notification_id: UUID = Path(..., description="The ID of the notification to delete"),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    notification_id: str = Path(..., pattern=_UUID_PATTERN, description="The ID of the notification to delete"),
+    current_user: CurrentUser = Depends(get_current_user),
+    notification_service: NotificationService = Depends(get_notification_service)
 ):
     """
     Delete a notification.
     
     Removes a specific notification.
     """
-    notification_service = NotificationService(db)
-    
-    # Check if notification exists and belongs to user
-    notification = await notification_service.get_notification(
-        user_id=UUID(current_user["sub"]),
-        notification_id=notification_id
-    )
-    
-    if not notification:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Notification not found"
-        )
-    
+    # Single DELETE ... WHERE id AND user_id; nothing deleted means the
+    # notification does not exist or belongs to someone else
     success = await notification_service.delete_notification(
+        user_id=current_user["sub_uuid"],
         notification_id=notification_id
     )
     
@@ -242,64 +242,55 @@ async def delete_notification(
             detail="Notification not found"
         )
     
+    await invalidate_cache(_count_cache_key(current_user["sub"]))
+    
     return None
 
 @router.delete("", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_all_notifications(
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    notification_service: NotificationService = Depends(get_notification_service)
 ):
     """
     Delete all notifications.
     
     Removes all notifications for the user.
     """
-    notification_service = NotificationService(db)
-    
     await notification_service.delete_all_notifications(
-        user_id=UUID(current_user["sub"])
+        user_id=current_user["sub_uuid"]
     )
+    await invalidate_cache(_count_cache_key(current_user["sub"]))
     
     return None
 
 @router.get("/preferences", response_model=List[NotificationPreference])
 async def list_notification_preferences(
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    preference_service: PreferenceService = Depends(get_preference_service)
 ):
     """
     List notification preferences.
     
     Returns the user's notification preferences for different notification types.
     """
-    preference_service = PreferenceService(db)
     preferences = await preference_service.list_preferences(
-        user_id=UUID(current_user["sub"])
+        user_id=current_user["sub_uuid"]
     )
     
-    return [
-        NotificationPreference(
-            type=preference.type,
-            email_enabled=preference.email_enabled,
-            push_enabled=preference.push_enabled,
-            in_app_enabled=preference.in_app_enabled
-        ) for preference in preferences
-    ]
+    return preferences
 
 @router.put("/preferences/{notification_type}", response_model=NotificationPreference)
 async def update_notification_preference(
     preference_data: NotificationPreferenceUpdate,
     notification_type: str = Path(..., description="The notification type to update preferences for"),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    preference_service: PreferenceService = Depends(get_preference_service)
 ):
     """
     Update notification preference.
     
     Updates the user's notification preferences for a specific notification type.
     """
-    preference_service = PreferenceService(db)
-    
     # Get at least one update field
     if preference_data.email_enabled is None and preference_data.push_enabled is None and preference_data.in_app_enabled is None:
         raise HTTPException(
@@ -309,19 +300,14 @@ async def update_notification_preference(
     
     try:
         preference = await preference_service.update_preference(
-            user_id=UUID(current_user["sub"]),
+            user_id=current_user["sub_uuid"],
             notification_type=notification_type,
             email_enabled=preference_data.email_enabled,
             push_enabled=preference_data.push_enabled,
             in_app_enabled=preference_data.in_app_enabled
         )
         
-        return NotificationPreference(
-            type=preference.type,
-            email_enabled=preference.email_enabled,
-            push_enabled=preference.push_enabled,
-            in_app_enabled=preference.in_app_enabled
-        )
+        return preference
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
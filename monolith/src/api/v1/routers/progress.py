@@ -1,9 +1,17 @@
-from typing import List, Dict, Any, Optional
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, List, Dict, Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+import orjson
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.dependencies import get_current_active_user, get_current_user, get_db
+from src.common.cache import cached_response, invalidate_cache
+from src.common.responses import conditional_on_last_modified
 from src.modules.courses.services.progress_service import ProgressService
 from src.modules.courses.services.enrollment_service import EnrollmentService
 from src.modules.courses.services.course_service import CourseService
@@ -19,17 +27,56 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Dashboard stats are polled; serve them from a short-lived per-user cache and
+# drop the entry whenever the user's lesson progress changes, so a body never
+# lags the Last-Modified read live from the database
+LEARNING_STATS_CACHE_TTL_SECONDS = 5
+
+def _learning_stats_cache_key(user_id: str) -> str:
+    return f"learningstats:{user_id}"
+
+# Serializers compiled once at import; handlers validate and dump straight to
+# JSON bytes instead of going through FastAPI's response_model pipeline
+_lesson_progress_adapter = TypeAdapter(LessonProgressResponse)
+_section_progress_adapter = TypeAdapter(SectionProgressResponse)
+_course_progress_adapter = TypeAdapter(CourseProgressResponse)
+
+def _json_response(adapter: TypeAdapter, data: Any) -> Response:
+    """Validate a payload with a precompiled adapter and return it as JSON."""
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(data)),
+        media_type="application/json"
+    )
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+async def _course_progress_ndjson(
+    progress_service: ProgressService,
+    user_id: str,
+    course_id: str,
+    summary: Dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """Yield the course summary, then one line per section as it is read."""
+    yield orjson.dumps(summary, default=str) + b"\n"
+    async for section in progress_service.iter_section_progress(user_id, course_id):
+        yield _section_progress_adapter.dump_json(
+            _section_progress_adapter.validate_python(section)
+        ) + b"\n"
+
 # Dependency to get ProgressService
 def get_progress_service(db: AsyncSession = Depends(get_db)) -> ProgressService:
     return ProgressService(db)
 
-def get_enrollment_service(db: AsyncSession = Depends(get_db)) -> EnrollmentService:
+# These two get their own sessions (use_cache=False) so get_course_progress can
+# run their queries concurrently with the progress service; an AsyncSession
+# must not be used by concurrent tasks
+def get_enrollment_service(db: AsyncSession = Depends(get_db, use_cache=False)) -> EnrollmentService:
     return EnrollmentService(db)
 
-def get_course_service(db: AsyncSession = Depends(get_db)) -> CourseService:
+def get_course_service(db: AsyncSession = Depends(get_db, use_cache=False)) -> CourseService:
     return CourseService(db)
 
-@router.get("/lesson/{lesson_id}", response_model=LessonProgressResponse)
+@router.get("/lesson/{lesson_id}", responses={200: {"model": LessonProgressResponse}})
 async def get_lesson_progress(
     lesson_id: str = Path(..., description="Lesson ID"),
     progress_service: ProgressService = Depends(get_progress_service),
@@ -42,16 +89,16 @@ async def get_lesson_progress(
     
     if not progress:
         # Return empty progress if not found
-        return {
+        return _json_response(_lesson_progress_adapter, {
             "lesson_id": lesson_id,
             "progress_percentage": 0.0,
             "status": "not_started",
             "last_position_seconds": 0
-        }
+        })
         
-    return progress
+    return _json_response(_lesson_progress_adapter, progress)
 
-@router.post("/lesson/{lesson_id}/update", response_model=LessonProgressResponse)
+@router.post("/lesson/{lesson_id}/update", responses={200: {"model": LessonProgressResponse}})
 async def update_lesson_progress(
     progress_data: LessonProgressUpdate,
     lesson_id: str = Path(..., description="Lesson ID"),
@@ -73,10 +120,12 @@ async def update_lesson_progress(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to update lesson progress"
         )
+    
+    await invalidate_cache(_learning_stats_cache_key(current_user["id"]))
         
-    return updated_progress
+    return _json_response(_lesson_progress_adapter, updated_progress)
 
-@router.post("/lesson/{lesson_id}/complete", response_model=LessonProgressResponse)
+@router.post("/lesson/{lesson_id}/complete", responses={200: {"model": LessonProgressResponse}})
 async def complete_lesson(
     lesson_id: str = Path(..., description="Lesson ID"),
     progress_service: ProgressService = Depends(get_progress_service),
@@ -94,10 +143,12 @@ async def complete_lesson(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to mark lesson as completed"
         )
+    
+    await invalidate_cache(_learning_stats_cache_key(current_user["id"]))
         
-    return completed_progress
+    return _json_response(_lesson_progress_adapter, completed_progress)
 
-@router.post("/lesson/{lesson_id}/reset", response_model=LessonProgressResponse)
+@router.post("/lesson/{lesson_id}/reset", responses={200: {"model": LessonProgressResponse}})
 async def reset_lesson_progress(
     lesson_id: str = Path(..., description="Lesson ID"),
     progress_service: ProgressService = Depends(get_progress_service),
@@ -115,11 +166,20 @@ async def reset_lesson_progress(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No progress found to reset"
         )
+    
+    await invalidate_cache(_learning_stats_cache_key(current_user["id"]))
         
-    return reset_progress
+    return _json_response(_lesson_progress_adapter, reset_progress)
 
-@router.get("/course/{course_id}", response_model=CourseProgressResponse)
+@router.get(
+    "/course/{course_id}",
+    responses={200: {
+        "model": CourseProgressResponse,
+        "content": {NDJSON_MEDIA_TYPE: {}}
+    }}
+)
 async def get_course_progress(
+    request: Request,
     course_id: str = Path(..., description="Course ID"),
     progress_service: ProgressService = Depends(get_progress_service),
     enrollment_service: EnrollmentService = Depends(get_enrollment_service),
@@ -128,10 +188,23 @@ async def get_course_progress(
 ):
     """
     Get detailed progress for a course.
+    
+    Clients sending `Accept: application/x-ndjson` get the response streamed
+    as newline-delimited JSON: a first line with the course, overall progress
+    and enrollment, then one line per section.
     """
-    # Check if user is enrolled in the course
-    enrollment_check = await enrollment_service.check_user_enrollment(
-        current_user["id"], course_id
+    stream = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    load_progress = (
+        progress_service.get_course_progress_summary if stream
+        else progress_service.get_course_progress
+    )
+    
+    # The enrollment check, course lookup and progress query are independent,
+    # so run them concurrently; progress is discarded on the rare 403/404
+    enrollment_check, course, progress = await asyncio.gather(
+        enrollment_service.check_user_enrollment(current_user["id"], course_id),
+        course_service.get_course_by_id(course_id),
+        load_progress(current_user["id"], course_id)
     )
     
     if not enrollment_check["is_enrolled"]:
@@ -140,26 +213,27 @@ async def get_course_progress(
             detail="You are not enrolled in this course"
         )
     
-    # Get course details
-    course = await course_service.get_course_by_id(course_id)
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
     
-    # Get progress details
-    progress = await progress_service.get_course_progress(current_user["id"], course_id)
-    
     if not progress:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Failed to retrieve course progress"
         )
     
-    return progress
+    if stream:
+        return StreamingResponse(
+            _course_progress_ndjson(progress_service, current_user["id"], course_id, progress),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+    
+    return _json_response(_course_progress_adapter, progress)
 
-@router.get("/section/{section_id}", response_model=SectionProgressResponse)
+@router.get("/section/{section_id}", responses={200: {"model": SectionProgressResponse}})
 async def get_section_progress(
     section_id: str = Path(..., description="Section ID"),
     progress_service: ProgressService = Depends(get_progress_service),
@@ -176,22 +250,12 @@ async def get_section_progress(
             detail="Section not found"
         )
     
-    return {
+    return _json_response(_section_progress_adapter, {
         "section_id": progress["section"].id,
         "title": progress["section"].title,
         "progress_percentage": progress["progress_percentage"],
-        "lessons": [
-            {
-                "lesson_id": lp["lesson"].id,
-                "title": lp["lesson"].title,
-                "type": lp["lesson"].type,
-                "status": lp["progress"].status if lp["progress"] else "not_started",
-                "progress_percentage": lp["progress"].progress_percentage if lp["progress"] else 0.0,
-                "last_position_seconds": lp["progress"].last_position_seconds if lp["progress"] else 0
-            }
-            for lp in progress["lessons"]
-        ]
-    }
+        "lessons": progress["lessons"]
+    })
 
 @router.get("/recent-activity", response_model=RecentActivityResponse)
 async def get_recent_activity(
@@ -211,8 +275,21 @@ async def get_recent_activity(
         "activities": activities
     }
 
+async def _learning_stats_last_modified(
+    progress_service: ProgressService,
+    current_user: Dict[str, Any],
+    **_
+) -> Optional[datetime]:
+    return await progress_service.get_learning_stats_last_modified(current_user["id"])
+
 @router.get("/learning-stats", response_model=LearningStatsResponse)
+@conditional_on_last_modified(_learning_stats_last_modified)
+@cached_response(
+    ttl=LEARNING_STATS_CACHE_TTL_SECONDS,
+    key=lambda current_user, **_: _learning_stats_cache_key(current_user["id"])
+)
 async def get_learning_stats(
+    request: Request,
     progress_service: ProgressService = Depends(get_progress_service),
     current_user: Dict[str, Any] = Depends(get_current_active_user)
 ):
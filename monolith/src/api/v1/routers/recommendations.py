@@ -1,15 +1,30 @@
+import asyncio
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from src.common.database import get_db
-from src.common.auth import get_current_user
+from src.common.database import AsyncSessionLocal, get_db
+from src.common.auth import CurrentUser, get_current_user
+from src.common.cache import cached_response
+from src.common.logger import get_logger
+from src.common.responses import ORJSONResponse
 from src.modules.recommendation.services.recommendation_service import RecommendationService
 
-router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/recommendations", tags=["Recommendations"], default_response_class=ORJSONResponse)
+
+# The combined feed runs every strategy; recommendations change slowly, so
+# serve it from a per-user cache and let entries expire
+ALL_RECOMMENDATIONS_CACHE_TTL_SECONDS = 300
+# Per-user content; browsers may reuse it briefly but shared caches must not
+ALL_RECOMMENDATIONS_CACHE_CONTROL = "private, max-age=120"
+
+def _all_recommendations_cache_key(user_id: str, limit_per_category: int) -> str:
+    return f"recs:all:{user_id}:{limit_per_category}"
 
 # Request/Response Models
 class RecommendedItem(BaseModel):
@@ -40,93 +55,106 @@ class AllRecommendationsResponse(BaseModel):
     new: List[RecommendedItem]
     continue_learning: List[RecommendedItem]
 
+# Shared by every item without metadata; model_construct does not copy it,
+# so it must never be mutated
+_EMPTY_METADATA: Dict[str, Any] = {}
+
+def _recommended_items(items: List[Dict[str, Any]], default_reason: str) -> List[RecommendedItem]:
+    """
+    Wrap a strategy's items, filling in the reason where none is given.
+    
+    Service output is trusted, so the items are built without validation.
+    """
+    return [
+        RecommendedItem.model_construct(
+            id=item["id"],
+            type=item["type"],
+            title=item["title"],
+            description=item["description"],
+            thumbnail_url=item.get("thumbnail_url"),
+            metadata=item.get("metadata") or _EMPTY_METADATA,
+            relevance_score=item["relevance_score"],
+            reason=item.get("reason", default_reason)
+        ) for item in items
+    ]
+
+# Strategies for the combined feed with each category's default reason, in
+# response field order
+_ALL_RECOMMENDATIONS_CATEGORIES = (
+    ("personalized", "get_personalized_recommendations", "Personalized for you"),
+    ("trending", "get_trending_content", "Trending"),
+    ("popular", "get_popular_content", "Popular"),
+    ("new", "get_new_content", "New"),
+    ("continue_learning", "get_continue_learning_recommendations", "Continue learning"),
+)
+
+async def _get_category(method_name: str, **kwargs: Any) -> Dict[str, Any]:
+    """
+    Run one recommendation strategy in its own session.
+    
+    An AsyncSession must not be shared by concurrent tasks, so each strategy
+    of the combined feed checks out its own pooled connection.
+    """
+    async with AsyncSessionLocal() as session:
+        return await getattr(RecommendationService(session), method_name)(**kwargs)
+
 # Routes
 @router.get("", response_model=AllRecommendationsResponse)
+@cached_response(
+    ttl=ALL_RECOMMENDATIONS_CACHE_TTL_SECONDS,
+    key=lambda current_user, limit_per_category, **_: _all_recommendations_cache_key(
+        current_user["sub"], limit_per_category
+    ),
+    cache_control=ALL_RECOMMENDATIONS_CACHE_CONTROL
+)
 async def get_all_recommendations(
+    request: Request,
     limit_per_category: int = Query(5, ge=1, le=20),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get all recommendations.
     
-    Returns a set of recommendations across different categories.
+    Returns a set of recommendations across different categories. Results
+    are cached per user for a few minutes and may be reused by the client
+    for two minutes. A category whose strategy fails is returned empty, and
+    such a partial feed is neither cached nor reusable by the client.
     """
-    recommendation_service = RecommendationService(db)
+    user_id = current_user["sub_uuid"]
     
-    recommendations = await recommendation_service.get_all_recommendations(
-        user_id=UUID(current_user["sub"]),
-        limit_per_category=limit_per_category
+    # Strategies are independent; run them concurrently so the feed takes as
+    # long as the slowest one rather than the sum
+    results = await asyncio.gather(
+        *(
+            _get_category(method_name, user_id=user_id, limit=limit_per_category, offset=0)
+            for _, method_name, _ in _ALL_RECOMMENDATIONS_CATEGORIES
+        ),
+        return_exceptions=True
     )
     
-    return AllRecommendationsResponse(
-        personalized=[
-            RecommendedItem(
-                id=item["id"],
-                type=item["type"],
-                title=item["title"],
-                description=item["description"],
-                thumbnail_url=item.get("thumbnail_url"),
-                metadata=item.get("metadata", {}),
-                relevance_score=item["relevance_score"],
-                reason=item.get("reason", "Personalized for you")
-            ) for item in recommendations["personalized"]
-        ],
-        trending=[
-            RecommendedItem(
-                id=item["id"],
-                type=item["type"],
-                title=item["title"],
-                description=item["description"],
-                thumbnail_url=item.get("thumbnail_url"),
-                metadata=item.get("metadata", {}),
-                relevance_score=item["relevance_score"],
-                reason=item.get("reason", "Trending")
-            ) for item in recommendations["trending"]
-        ],
-        popular=[
-            RecommendedItem(
-                id=item["id"],
-                type=item["type"],
-                title=item["title"],
-                description=item["description"],
-                thumbnail_url=item.get("thumbnail_url"),
-                metadata=item.get("metadata", {}),
-                relevance_score=item["relevance_score"],
-                reason=item.get("reason", "Popular")
-            ) for item in recommendations["popular"]
-        ],
-        new=[
-            RecommendedItem(
-                id=item["id"],
-                type=item["type"],
-                title=item["title"],
-                description=item["description"],
-                thumbnail_url=item.get("thumbnail_url"),
-                metadata=item.get("metadata", {}),
-                relevance_score=item["relevance_score"],
-                reason=item.get("reason", "New")
-            ) for item in recommendations["new"]
-        ],
-        continue_learning=[
-            RecommendedItem(
-                id=item["id"],
-                type=item["type"],
-                title=item["title"],
-                description=item["description"],
-                thumbnail_url=item.get("thumbnail_url"),
-                metadata=item.get("metadata", {}),
-                relevance_score=item["relevance_score"],
-                reason=item.get("reason", "Continue learning")
-            ) for item in recommendations["continue_learning"]
-        ]
-    )
+    recommendations: Dict[str, List[RecommendedItem]] = {}
+    failed = False
+    for (category, _, default_reason), result in zip(_ALL_RECOMMENDATIONS_CATEGORIES, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error getting {category} recommendations: {str(result)}", exc_info=result)
+            recommendations[category] = []
+            failed = True
+        else:
+            recommendations[category] = _recommended_items(result["items"], default_reason)
+    
+    feed = AllRecommendationsResponse(**recommendations)
+    if failed:
+        # A Response bypasses cached_response, so a transient failure does not
+        # blank the category for the lifetime of the cache entry
+        return ORJSONResponse(feed.model_dump(), headers={"Cache-Control": "no-store"})
+    
+    return feed
 
-@router.get("/personalized", response_model=RecommendationResponse)
+@router.get("/personalized", responses={200: {"model": RecommendationResponse}})
 async def get_personalized_recommendations(
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -138,33 +166,22 @@ async def get_personalized_recommendations(
     recommendation_service = RecommendationService(db)
     
     recommendations = await recommendation_service.get_personalized_recommendations(
-        user_id=UUID(current_user["sub"]),
+        user_id=current_user["sub_uuid"],
         limit=limit,
         offset=offset
     )
     
-    return RecommendationResponse(
-        recommendations=[
-            RecommendedItem(
-                id=item["id"],
-                type=item["type"],
-                title=item["title"],
-                description=item["description"],
-                thumbnail_url=item.get("thumbnail_url"),
-                metadata=item.get("metadata", {}),
-                relevance_score=item["relevance_score"],
-                reason=item.get("reason", "Personalized for you")
-            ) for item in recommendations["items"]
-        ],
+    return ORJSONResponse(RecommendationResponse(
+        recommendations=_recommended_items(recommendations["items"], "Personalized for you"),
         category="personalized",
         total=recommendations["total"]
-    )
+    ).model_dump())
 
-@router.get("/trending", response_model=RecommendationResponse)
+@router.get("/trending", responses={200: {"model": RecommendationResponse}})
 async def get_trending_content(
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -175,33 +192,22 @@ async def get_trending_content(
     recommendation_service = RecommendationService(db)
     
     trending = await recommendation_service.get_trending_content(
-        user_id=UUID(current_user["sub"]),
+        user_id=current_user["sub_uuid"],
         limit=limit,
         offset=offset
     )
     
-    return RecommendationResponse(
-        recommendations=[
-            RecommendedItem(
-                id=item["id"],
-                type=item["type"],
-                title=item["title"],
-                description=item["description"],
-                thumbnail_url=item.get("thumbnail_url"),
-                metadata=item.get("metadata", {}),
-                relevance_score=item["relevance_score"],
-                reason=item.get("reason", "Trending")
-            ) for item in trending["items"]
-        ],
+    return ORJSONResponse(RecommendationResponse(
+        recommendations=_recommended_items(trending["items"], "Trending"),
         category="trending",
         total=trending["total"]
-    )
+    ).model_dump())
 
-@router.get("/similar-users", response_model=RecommendationResponse)
+@router.get("/similar-users", responses={200: {"model": RecommendationResponse}})
 async def get_similar_users_recommendations(
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -212,33 +218,22 @@ async def get_similar_users_recommendations(
     recommendation_service = RecommendationService(db)
     
     recommendations = await recommendation_service.get_similar_users_recommendations(
-        user_id=UUID(current_user["sub"]),
+        user_id=current_user["sub_uuid"],
         limit=limit,
         offset=offset
     )
     
-    return RecommendationResponse(
-        recommendations=[
-            RecommendedItem(
-                id=item["id"],
-                type=item["type"],
-                title=item["title"],
-                description=item["description"],
-                thumbnail_url=item.get("thumbnail_url"),
-                metadata=item.get("metadata", {}),
-                relevance_score=item["relevance_score"],
-                reason=item.get("reason", "Users like you enjoyed this")
-            ) for item in recommendations["items"]
-        ],
+    return ORJSONResponse(RecommendationResponse(
+        recommendations=_recommended_items(recommendations["items"], "Users like you enjoyed this"),
         category="similar_users",
         total=recommendations["total"]
-    )
+    ).model_dump())
 
-@router.get("/continue-learning", response_model=RecommendationResponse)
+@router.get("/continue-learning", responses={200: {"model": RecommendationResponse}})
 async def get_continue_learning_recommendations(
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -249,34 +244,23 @@ async def get_continue_learning_recommendations(
     recommendation_service = RecommendationService(db)
     
     recommendations = await recommendation_service.get_continue_learning_recommendations(
-        user_id=UUID(current_user["sub"]),
+        user_id=current_user["sub_uuid"],
         limit=limit,
         offset=offset
     )
     
-    return RecommendationResponse(
-        recommendations=[
-            RecommendedItem(
-                id=item["id"],
-                type=item["type"],
-                title=item["title"],
-                description=item["description"],
-                thumbnail_url=item.get("thumbnail_url"),
-                metadata=item.get("metadata", {}),
-                relevance_score=item["relevance_score"],
-                reason=item.get("reason", "Continue learning")
-            ) for item in recommendations["items"]
-        ],
+    return ORJSONResponse(RecommendationResponse(
+        recommendations=_recommended_items(recommendations["items"], "Continue learning"),
         category="continue_learning",
         total=recommendations["total"]
-    )
+    ).model_dump())
 
-@router.get("/new", response_model=RecommendationResponse)
+@router.get("/new", responses={200: {"model": RecommendationResponse}})
 async def get_new_content(
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
     days: int = Query(30, ge=1, le=90),
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -287,25 +271,14 @@ async def get_new_content(
     recommendation_service = RecommendationService(db)
     
     new_content = await recommendation_service.get_new_content(
-        user_id=UUID(current_user["sub"]),
+        user_id=current_user["sub_uuid"],
         days=days,
         limit=limit,
         offset=offset
     )
     
-    return RecommendationResponse(
-        recommendations=[
-            RecommendedItem(
-                id=item["id"],
-                type=item["type"],
-                title=item["title"],
-                description=item["description"],
-                thumbnail_url=item.get("thumbnail_url"),
-                metadata=item.get("metadata", {}),
-                relevance_score=item["relevance_score"],
-                reason=item.get("reason", f"Added in the last {days} days")
-            ) for item in new_content["items"]
-        ],
+    return ORJSONResponse(RecommendationResponse(
+        recommendations=_recommended_items(new_content["items"], f"Added in the last {days} days"),
         category="new",
         total=new_content["total"]
-    )
+    ).model_dump())
@@ -1,15 +1,66 @@
-from typing import List, Optional, Dict, Any
+import re
+from typing import List, Literal, Optional, Dict, Any, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, Path
+import msgspec
+import orjson
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Path, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
-from src.common.database import get_db
-from src.common.auth import get_current_user
+from src.common.database import AsyncSessionLocal, get_db
+from src.api.v1.dependencies import get_optional_current_user
+from src.common.auth import CurrentUser
+from src.common.cache import cached_response, get_cached, render_payload, set_cached
+from src.common.responses import ORJSONResponse
 from src.modules.search.services.search_service import SearchService
 
-router = APIRouter(prefix="/search", tags=["Search"])
+router = APIRouter(prefix="/search", tags=["Search"], default_response_class=ORJSONResponse)
+
+# Popular searches are global and change slowly; cache them for all users.
+# The default page is also refreshed in the background (see
+# warm_popular_searches_cache) so requests do not pay for the aggregation
+POPULAR_SEARCHES_CACHE_TTL_SECONDS = 900
+POPULAR_SEARCHES_WARM_LIMITS = (10,)
+
+def _popular_searches_cache_key(limit: int) -> str:
+    return f"search:popular:{limit}"
+
+# Related content depends only on the item (and the user when signed in);
+# personalized lists are kept for less time
+RELATED_CONTENT_CACHE_TTL_SECONDS = 1800
+RELATED_CONTENT_PERSONALIZED_CACHE_TTL_SECONDS = 300
+
+def _related_content_cache_key(
+    content_type: str,
+    content_id: UUID,
+    limit: int,
+    user_id: Optional[UUID]
+) -> str:
+    key = f"related:{content_type}:{content_id}:{limit}"
+    return f"{key}:u:{user_id}" if user_id else key
+
+_split_csv = re.compile(r"\s*,\s*").split
+
+def _parse_csv(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Split a comma-separated query parameter, dropping blank entries."""
+    if not value:
+        return None
+    return tuple(part for part in _split_csv(value.strip()) if part) or None
+
+# Autocomplete runs on every keystroke; cache suggestions per prefix briefly.
+# Single characters match too broadly to be worth caching
+AUTOCOMPLETE_CACHE_TTL_SECONDS = 90
+AUTOCOMPLETE_CACHE_MIN_PREFIX = 2
+
+def _autocomplete_cache_key(q: str, limit: int, user_id: Optional[UUID]) -> str:
+    key = f"auto:{limit}:{q.strip().lower()}"
+    # Suggestions are personalized for signed-in users
+    return f"{key}:u:{user_id}" if user_id else key
+
+# Content types that have related content
+RelatedContentType = Literal["course", "video", "assessment", "learning_path"]
 
 # Request/Response Models
 class SearchResultItem(BaseModel):
@@ -46,9 +97,42 @@ class PopularSearchesResponse(BaseModel):
     """Popular searches response model."""
     searches: List[Dict[str, Any]]
 
+# Wire format of search results. Search is the hottest path here, so results
+# are encoded by msgspec from trusted service output; the pydantic models
+# above only document the schema
+class _SearchResultStruct(msgspec.Struct):
+    id: UUID
+    type: str
+    title: str
+    description: str
+    relevance_score: float
+    thumbnail_url: Optional[str] = None
+    metadata: Dict[str, Any] = {}
+
+class _SearchResponseStruct(msgspec.Struct):
+    query: str
+    total_results: int
+    results: List[_SearchResultStruct]
+    filters_applied: Dict[str, Any]
+
+def _search_results(items: List[Dict[str, Any]]) -> List[_SearchResultStruct]:
+    """Wrap search service items for encoding; Struct init does not validate."""
+    return [
+        _SearchResultStruct(
+            id=item["id"],
+            type=item["type"],
+            title=item["title"],
+            description=item["description"],
+            relevance_score=item["relevance_score"],
+            thumbnail_url=item.get("thumbnail_url"),
+            metadata=item.get("metadata") or {}
+        ) for item in items
+    ]
+
 # Routes
-@router.get("", response_model=SearchResponse)
+@router.get("", responses={200: {"model": SearchResponse}})
 async def search(
+    background_tasks: BackgroundTasks,
     q: str = Query(..., description="Search query"),
     types: Optional[str] = Query(None, description="Comma-separated list of content types to include"),
     category: Optional[str] = Query(None, description="Filter by category"),
@@ -56,7 +140,7 @@ async def search(
     tags: Optional[str] = Query(None, description="Comma-separated list of tags to filter by"),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: Optional[Dict[str, Any]] = Depends(get_current_user),
+    current_user: Optional[CurrentUser] = Depends(get_optional_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -68,8 +152,8 @@ async def search(
     search_service = SearchService(db)
     
     # Parse filter parameters
-    filter_types = types.split(",") if types else None
-    filter_tags = tags.split(",") if tags else None
+    filter_types = _parse_csv(types.lower()) if types else None
+    filter_tags = _parse_csv(tags)
     
     # Build filters dictionary
     filters = {
@@ -80,7 +164,7 @@ async def search(
     }
     
     # If user is authenticated, include user ID for personalized results
-    user_id = UUID(current_user["sub"]) if current_user else None
+    user_id = current_user["sub_uuid"] if current_user else None
     
     search_results = await search_service.search(
         query=q,
@@ -90,56 +174,61 @@ async def search(
         offset=offset
     )
     
-    # Log search query if authenticated user
+    # Log search query if authenticated user, after the response is sent
     if user_id:
-        await search_service.log_search_query(
+        background_tasks.add_task(
+            search_service.log_search_query,
             user_id=user_id,
             query=q,
             filters=filters,
             results_count=search_results["total_results"]
         )
     
-    return SearchResponse(
-        query=q,
-        total_results=search_results["total_results"],
-        results=[
-            SearchResultItem(
-                id=item["id"],
-                type=item["type"],
-                title=item["title"],
-                description=item["description"],
-                thumbnail_url=item.get("thumbnail_url"),
-                metadata=item.get("metadata", {}),
-                relevance_score=item["relevance_score"]
-            ) for item in search_results["results"]
-        ],
-        filters_applied=filters
+    return Response(
+        content=msgspec.json.encode(_SearchResponseStruct(
+            query=q,
+            total_results=search_results["total_results"],
+            results=_search_results(search_results["results"]),
+            filters_applied=filters
+        )),
+        media_type="application/json"
     )
 
-@router.get("/autocomplete", response_model=SearchSuggestionResponse)
+@router.get("/autocomplete", responses={200: {"model": SearchSuggestionResponse}})
 async def autocomplete(
     q: str = Query(..., description="Partial search query"),
     limit: int = Query(5, ge=1, le=10),
-    current_user: Optional[Dict[str, Any]] = Depends(get_current_user),
+    current_user: Optional[CurrentUser] = Depends(get_optional_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get autocomplete suggestions.
     
-    Returns search term suggestions based on a partial query.
+    Returns search term suggestions based on a partial query. Suggestions
+    for prefixes of two or more characters are cached briefly.
     """
     search_service = SearchService(db)
     
     # If user is authenticated, include user ID for personalized suggestions
-    user_id = UUID(current_user["sub"]) if current_user else None
+    user_id = current_user["sub_uuid"] if current_user else None
     
-    suggestions = await search_service.get_autocomplete_suggestions(
-        query=q,
-        user_id=user_id,
-        limit=limit
-    )
+    cache_key = None
+    if len(q.strip()) >= AUTOCOMPLETE_CACHE_MIN_PREFIX:
+        cache_key = _autocomplete_cache_key(q, limit, user_id)
     
-    return SearchSuggestionResponse(
+    cached = await get_cached(cache_key) if cache_key else None
+    if cached is not None:
+        suggestions = orjson.loads(cached)
+    else:
+        suggestions = await search_service.get_autocomplete_suggestions(
+            query=q,
+            user_id=user_id,
+            limit=limit
+        )
+        if cache_key:
+            await set_cached(cache_key, orjson.dumps(suggestions), AUTOCOMPLETE_CACHE_TTL_SECONDS)
+    
+    return ORJSONResponse(SearchSuggestionResponse(
         query=q,
         suggestions=[
             SearchSuggestion(
@@ -147,18 +236,24 @@ async def autocomplete(
                 score=suggestion["score"]
             ) for suggestion in suggestions
         ]
-    )
+    ).model_dump())
 
 @router.get("/popular", response_model=PopularSearchesResponse)
+@cached_response(
+    ttl=POPULAR_SEARCHES_CACHE_TTL_SECONDS,
+    key=lambda limit, **_: _popular_searches_cache_key(limit)
+)
 async def popular_searches(
+    request: Request,
     limit: int = Query(10, ge=1, le=20),
-    current_user: Optional[Dict[str, Any]] = Depends(get_current_user),
+    current_user: Optional[CurrentUser] = Depends(get_optional_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get popular searches.
     
-    Returns the most popular search queries across all users.
+    Returns the most popular search queries across all users. Results are
+    cached for 15 minutes.
     """
     search_service = SearchService(db)
     
@@ -168,27 +263,29 @@ async def popular_searches(
         searches=popular
     )
 
-@router.get("/related/{content_type}/{content_id}", response_model=List[SearchResultItem])
+@router.get("/related/{content_type}/{content_id}", responses={200: {"model": List[SearchResultItem]}})
 async def related_content(
-    content_type: str = Path(..., description="Content type: 'course', 'video', 'assessment', 'learning_path'"),
+    content_type: RelatedContentType = Path(..., description="Content type: 'course', 'video', 'assessment', 'learning_path'"),
     content_id: UUID = Path(..., description="Content ID"),
     limit: int = Query(5, ge=1, le=20),
-    current_user: Optional[Dict[str, Any]] = Depends(get_current_user),
+    current_user: Optional[CurrentUser] = Depends(get_optional_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get related content.
     
-    Returns content related to the specified item.
+    Returns content related to the specified item. Results are cached for
+    30 minutes, or 5 minutes when personalized for a signed-in user.
     """
     search_service = SearchService(db)
     
-    valid_types = ["course", "video", "assessment", "learning_path"]
-    if content_type not in valid_types:
-        return []
-    
     # If user is authenticated, include user ID for personalized recommendations
-    user_id = UUID(current_user["sub"]) if current_user else None
+    user_id = current_user["sub_uuid"] if current_user else None
+    
+    cache_key = _related_content_cache_key(content_type, content_id, limit, user_id)
+    cached = await get_cached(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
     
     related = await search_service.get_related_content(
         content_type=content_type,
@@ -197,14 +294,25 @@ async def related_content(
         limit=limit
     )
     
-    return [
-        SearchResultItem(
-            id=item["id"],
-            type=item["type"],
-            title=item["title"],
-            description=item["description"],
-            thumbnail_url=item.get("thumbnail_url"),
-            metadata=item.get("metadata", {}),
-            relevance_score=item["relevance_score"]
-        ) for item in related
-    ]
+    payload = msgspec.json.encode(_search_results(related))
+    await set_cached(
+        cache_key,
+        payload,
+        RELATED_CONTENT_PERSONALIZED_CACHE_TTL_SECONDS if user_id else RELATED_CONTENT_CACHE_TTL_SECONDS
+    )
+    
+    return Response(content=payload, media_type="application/json")
+
+async def warm_popular_searches_cache() -> None:
+    """
+    Recompute popular searches and store them under popular_searches' keys.
+    """
+    async with AsyncSessionLocal() as session:
+        search_service = SearchService(session)
+        for limit in POPULAR_SEARCHES_WARM_LIMITS:
+            popular = await search_service.get_popular_searches(limit=limit)
+            await set_cached(
+                _popular_searches_cache_key(limit),
+                render_payload(PopularSearchesResponse(searches=popular)),
+                POPULAR_SEARCHES_CACHE_TTL_SECONDS
+            )
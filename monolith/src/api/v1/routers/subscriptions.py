@@ -1,29 +1,64 @@
-from typing import List, Optional, Dict, Any
+import asyncio
+from typing import List, Literal, Optional
 from uuid import UUID
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
-from src.common.database import get_db
-from src.common.auth import get_current_user
+from src.common.database import AsyncSessionLocal, get_db
+from src.common.auth import CurrentUser, get_current_user
+from src.common.cache import cached_response, get_cached, set_cached
 from src.modules.subscription.services.subscription_service import SubscriptionService
 from src.modules.subscription.services.plan_service import PlanService
 
 router = APIRouter(prefix="/subscriptions", tags=["Subscriptions"])
 
+# The plan catalogue is the same for every user and rarely changes; there are
+# no plan mutation endpoints yet, so cached entries simply expire
+PLANS_CACHE_KEY = "subs:plans:v1"
+PLANS_CACHE_TTL_SECONDS = 60
+
+def _plan_cache_key(plan_id: UUID) -> str:
+    return f"subs:plan:v1:{plan_id}"
+
+def _missing_plan_cache_key(plan_id: UUID) -> str:
+    return f"subs:plan:v1:{plan_id}:missing"
+
+BillingCycle = Literal["monthly", "yearly"]
+
+# Dependency to get SubscriptionService
+def get_subscription_service(db: AsyncSession = Depends(get_db)) -> SubscriptionService:
+    return SubscriptionService(db)
+
+# Dependency to get PlanService
+def get_plan_service(db: AsyncSession = Depends(get_db)) -> PlanService:
+    return PlanService(db)
+
+async def _get_plan(plan_id: UUID):
+    """
+    Look up a plan in its own session.
+    
+    An AsyncSession must not be shared by concurrent tasks, so a lookup that
+    runs alongside the request session's queries checks out its own connection.
+    """
+    async with AsyncSessionLocal() as session:
+        return await PlanService(session).get_plan(plan_id)
+
 # Request/Response Models
 class PlanFeature(BaseModel):
     """Subscription plan feature model."""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
     name: str
     description: str
-    
-    class Config:
-        from_attributes = True
 
 class Plan(BaseModel):
     """Subscription plan model."""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
     id: UUID
     name: str
     description: str
@@ -31,14 +66,13 @@ class Plan(BaseModel):
     price_yearly: float
     features: List[PlanFeature]
     is_active: bool
-    
-    class Config:
-        from_attributes = True
+
+_plan_list_adapter = TypeAdapter(List[Plan])
 
 class SubscriptionBase(BaseModel):
     """Base subscription model."""
     plan_id: UUID
-    billing_cycle: str = Field(..., description="Billing cycle: 'monthly', 'yearly'")
+    billing_cycle: BillingCycle = Field(..., description="Billing cycle: 'monthly', 'yearly'")
 
 class SubscriptionCreateRequest(SubscriptionBase):
     """Subscription creation request model."""
@@ -47,23 +81,24 @@ class SubscriptionCreateRequest(SubscriptionBase):
 class SubscriptionUpdateRequest(BaseModel):
     """Subscription update request model."""
     plan_id: Optional[UUID] = None
-    billing_cycle: Optional[str] = Field(None, description="Billing cycle: 'monthly', 'yearly'")
+    billing_cycle: Optional[BillingCycle] = Field(None, description="Billing cycle: 'monthly', 'yearly'")
     auto_renew: Optional[bool] = None
 
 class SubscriptionResponse(BaseModel):
     """Subscription response model."""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
     id: UUID
     user_id: UUID
     plan: Plan
     status: str
     billing_cycle: str
-    start_date: str
-    end_date: str
+    start_date: datetime
+    end_date: datetime
     auto_renew: bool
     cancel_at_period_end: bool
-    
-    class Config:
-        from_attributes = True
+
+_subscription_list_adapter = TypeAdapter(List[SubscriptionResponse])
 
 class CancelSubscriptionRequest(BaseModel):
     """Cancel subscription request model."""
@@ -71,82 +106,70 @@ class CancelSubscriptionRequest(BaseModel):
 
 # Routes
 @router.get("/plans", response_model=List[Plan])
+@cached_response(ttl=PLANS_CACHE_TTL_SECONDS, key=lambda **_: PLANS_CACHE_KEY)
 async def list_plans(
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    plan_service: PlanService = Depends(get_plan_service)
 ):
     """
     List subscription plans.
     
-    Returns a list of available subscription plans.
+    Returns a list of available subscription plans. Results are cached for
+    one minute.
     """
-    plan_service = PlanService(db)
     plans = await plan_service.list_active_plans()
     
-    return [
-        Plan(
-            id=plan.id,
-            name=plan.name,
-            description=plan.description,
-            price_monthly=plan.price_monthly,
-            price_yearly=plan.price_yearly,
-            features=[
-                PlanFeature(
-                    name=feature.name,
-                    description=feature.description
-                ) for feature in plan.features
-            ],
-            is_active=plan.is_active
-        ) for plan in plans
-    ]
+    return _plan_list_adapter.dump_json(
+        _plan_list_adapter.validate_python(plans, from_attributes=True)
+    )
 
 @router.get("/plans/{plan_id}", response_model=Plan)
+@cached_response(
+    ttl=PLANS_CACHE_TTL_SECONDS,
+    key=lambda plan_id, **_: _plan_cache_key(plan_id)
+)
 async def get_plan(
+    request: Request,
     plan_id: UUID = Path(..., description="The ID of the plan to retrieve"),
-    db: AsyncSession = Depends(get_db)
+    plan_service: PlanService = Depends(get_plan_service)
 ):
     """
     Get a specific subscription plan by ID.
     
-    Returns the details of a subscription plan.
+    Returns the details of a subscription plan. Results are cached for one
+    minute.
     """
-    plan_service = PlanService(db)
+    # Only reached on a cache miss, so hits stay at one Redis round trip while
+    # repeated lookups of an unknown plan still skip the database
+    if await get_cached(_missing_plan_cache_key(plan_id)) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Plan not found"
+        )
+    
     plan = await plan_service.get_plan(plan_id)
     
     if not plan:
+        await set_cached(_missing_plan_cache_key(plan_id), b"1", PLANS_CACHE_TTL_SECONDS)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Plan not found"
         )
     
-    return Plan(
-        id=plan.id,
-        name=plan.name,
-        description=plan.description,
-        price_monthly=plan.price_monthly,
-        price_yearly=plan.price_yearly,
-        features=[
-            PlanFeature(
-                name=feature.name,
-                description=feature.description
-            ) for feature in plan.features
-        ],
-        is_active=plan.is_active
-    )
+    return Plan.model_validate(plan)
 
 @router.post("", response_model=SubscriptionResponse, status_code=status.HTTP_201_CREATED)
 async def create_subscription(
     subscription_data: SubscriptionCreateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    subscription_service: SubscriptionService = Depends(get_subscription_service),
+    plan_service: PlanService = Depends(get_plan_service)
 ):
     """
     Create a new subscription.
     
     Creates a new subscription for the current user.
     """
-    subscription_service = SubscriptionService(db)
-    plan_service = PlanService(db)
-    
     # Check if plan exists and is active
     plan = await plan_service.get_plan(subscription_data.plan_id)
     if not plan or not plan.is_active:
@@ -155,44 +178,14 @@ async def create_subscription(
             detail="Invalid or inactive plan"
         )
     
-    # Validate billing cycle
-    if subscription_data.billing_cycle not in ["monthly", "yearly"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid billing cycle. Must be 'monthly' or 'yearly'"
-        )
-    
     try:
         subscription = await subscription_service.create_subscription(
-            user_id=UUID(current_user["sub"]),
+            user_id=current_user["sub_uuid"],
             plan_id=subscription_data.plan_id,
             billing_cycle=subscription_data.billing_cycle
         )
         
-        return SubscriptionResponse(
-            id=subscription.id,
-            user_id=subscription.user_id,
-            plan=Plan(
-                id=subscription.plan.id,
-                name=subscription.plan.name,
-                description=subscription.plan.description,
-                price_monthly=subscription.plan.price_monthly,
-                price_yearly=subscription.plan.price_yearly,
-                features=[
-                    PlanFeature(
-                        name=feature.name,
-                        description=feature.description
-                    ) for feature in subscription.plan.features
-                ],
-                is_active=subscription.plan.is_active
-            ),
-            status=subscription.status,
-            billing_cycle=subscription.billing_cycle,
-            start_date=subscription.start_date.isoformat(),
-            end_date=subscription.end_date.isoformat(),
-            auto_renew=subscription.auto_renew,
-            cancel_at_period_end=subscription.cancel_at_period_end
-        )
+        return subscription
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -201,65 +194,46 @@ async def create_subscription(
 
 @router.get("/current", response_model=Optional[SubscriptionResponse])
 async def get_current_subscription(
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    subscription_service: SubscriptionService = Depends(get_subscription_service)
 ):
     """
     Get current subscription.
     
     Returns the current active subscription for the user, if any.
     """
-    subscription_service = SubscriptionService(db)
     subscription = await subscription_service.get_active_subscription(
-        user_id=UUID(current_user["sub"])
+        user_id=current_user["sub_uuid"]
     )
     
     if not subscription:
         return None
     
-    return SubscriptionResponse(
-        id=subscription.id,
-        user_id=subscription.user_id,
-        plan=Plan(
-            id=subscription.plan.id,
-            name=subscription.plan.name,
-            description=subscription.plan.description,
-            price_monthly=subscription.plan.price_monthly,
-            price_yearly=subscription.plan.price_yearly,
-            features=[
-                PlanFeature(
-                    name=feature.name,
-                    description=feature.description
-                ) for feature in subscription.plan.features
-            ],
-            is_active=subscription.plan.is_active
-        ),
-        status=subscription.status,
-        billing_cycle=subscription.billing_cycle,
-        start_date=subscription.start_date.isoformat(),
-        end_date=subscription.end_date.isoformat(),
-        auto_renew=subscription.auto_renew,
-        cancel_at_period_end=subscription.cancel_at_period_end
-    )
+    return subscription
 
 @router.put("/current", response_model=SubscriptionResponse)
 async def update_subscription(
     subscription_data: SubscriptionUpdateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    subscription_service: SubscriptionService = Depends(get_subscription_service)
 ):
     """
     Update current subscription.
     
     Updates the current subscription for the user.
     """
-    subscription_service = SubscriptionService(db)
-    plan_service = PlanService(db)
-    
-    # Get current subscription
-    current_subscription = await subscription_service.get_active_subscription(
-        user_id=UUID(current_user["sub"])
+    # Get current subscription and, if a new plan is requested, the plan
+    # concurrently rather than one round trip after the other
+    get_current = subscription_service.get_active_subscription(
+        user_id=current_user["sub_uuid"]
     )
+    if subscription_data.plan_id:
+        current_subscription, plan = await asyncio.gather(
+            get_current,
+            _get_plan(subscription_data.plan_id)
+        )
+    else:
+        current_subscription = await get_current
     
     if not current_subscription:
         raise HTTPException(
@@ -269,20 +243,12 @@ async def update_subscription(
     
     # Validate plan if provided
     if subscription_data.plan_id:
-        plan = await plan_service.get_plan(subscription_data.plan_id)
         if not plan or not plan.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid or inactive plan"
             )
     
-    # Validate billing cycle if provided
-    if subscription_data.billing_cycle and subscription_data.billing_cycle not in ["monthly", "yearly"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid billing cycle. Must be 'monthly' or 'yearly'"
-        )
-    
     try:
         subscription = await subscription_service.update_subscription(
             subscription_id=current_subscription.id,
@@ -291,30 +257,7 @@ async def update_subscription(
             auto_renew=subscription_data.auto_renew
         )
         
-        return SubscriptionResponse(
-            id=subscription.id,
-            user_id=subscription.user_id,
-            plan=Plan(
-                id=subscription.plan.id,
-                name=subscription.plan.name,
-                description=subscription.plan.description,
-                price_monthly=subscription.plan.price_monthly,
-                price_yearly=subscription.plan.price_yearly,
-                features=[
-                    PlanFeature(
-                        name=feature.name,
-                        description=feature.description
-                    ) for feature in subscription.plan.features
-                ],
-                is_active=subscription.plan.is_active
-            ),
-            status=subscription.status,
-            billing_cycle=subscription.billing_cycle,
-            start_date=subscription.start_date.isoformat(),
-            end_date=subscription.end_date.isoformat(),
-            auto_renew=subscription.auto_renew,
-            cancel_at_period_end=subscription.cancel_at_period_end
-        )
+        return subscription
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -324,8 +267,8 @@ async def update_subscription(
 @router.post("/current/cancel", response_model=SubscriptionResponse)
 async def cancel_subscription(
     cancel_data: CancelSubscriptionRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    subscription_service: SubscriptionService = Depends(get_subscription_service)
 ):
     """
     Cancel subscription.
@@ -334,11 +277,9 @@ async def cancel_subscription(
     If cancel_immediately is True, the subscription is canceled immediately.
     Otherwise, it will be canceled at the end of the billing period.
     """
-    subscription_service = SubscriptionService(db)
-    
     # Get current subscription
     current_subscription = await subscription_service.get_active_subscription(
-        user_id=UUID(current_user["sub"])
+        user_id=current_user["sub_uuid"]
     )
     
     if not current_subscription:
@@ -353,78 +294,38 @@ async def cancel_subscription(
             cancel_immediately=cancel_data.cancel_immediately
         )
         
-        return SubscriptionResponse(
-            id=subscription.id,
-            user_id=subscription.user_id,
-            plan=Plan(
-                id=subscription.plan.id,
-                name=subscription.plan.name,
-                description=subscription.plan.description,
-                price_monthly=subscription.plan.price_monthly,
-                price_yearly=subscription.plan.price_yearly,
-                features=[
-                    PlanFeature(
-                        name=feature.name,
-                        description=feature.description
-                    ) for feature in subscription.plan.features
-                ],
-                is_active=subscription.plan.is_active
-            ),
-            status=subscription.status,
-            billing_cycle=subscription.billing_cycle,
-            start_date=subscription.start_date.isoformat(),
-            end_date=subscription.end_date.isoformat(),
-            auto_renew=subscription.auto_renew,
-            cancel_at_period_end=subscription.cancel_at_period_end
-        )
+        return subscription
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
-@router.get("/history", response_model=List[SubscriptionResponse])
+# An NDJSON variant, like /progress/course/{course_id}, only pays off once
+# SubscriptionService can yield rows from session.stream(); over a fully
+# loaded page it saves no memory, so it waits for that service
+@router.get("/history", responses={200: {"model": List[SubscriptionResponse]}})
 async def get_subscription_history(
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    subscription_service: SubscriptionService = Depends(get_subscription_service)
 ):
     """
     Get subscription history.
     
     Returns a list of all subscriptions for the user, including past ones.
     """
-    subscription_service = SubscriptionService(db)
     subscriptions = await subscription_service.get_subscription_history(
-        user_id=UUID(current_user["sub"]),
+        user_id=current_user["sub_uuid"],
         limit=limit,
         offset=offset
     )
     
-    return [
-        SubscriptionResponse(
-            id=subscription.id,
-            user_id=subscription.user_id,
-            plan=Plan(
-                id=subscription.plan.id,
-                name=subscription.plan.name,
-                description=subscription.plan.description,
-                price_monthly=subscription.plan.price_monthly,
-                price_yearly=subscription.plan.price_yearly,
-                features=[
-                    PlanFeature(
-                        name=feature.name,
-                        description=feature.description
-                    ) for feature in subscription.plan.features
-                ],
-                is_active=subscription.plan.is_active
-            ),
-            status=subscription.status,
-            billing_cycle=subscription.billing_cycle,
-            start_date=subscription.start_date.isoformat(),
-            end_date=subscription.end_date.isoformat(),
-            auto_renew=subscription.auto_renew,
-            cancel_at_period_end=subscription.cancel_at_period_end
-        ) for subscription in subscriptions
-    ]
+    # Validate and dump in one pass instead of response_model's extra round trip
+    return Response(
+        content=_subscription_list_adapter.dump_json(
+            _subscription_list_adapter.validate_python(subscriptions, from_attributes=True)
+        ),
+        media_type="application/json"
+    )
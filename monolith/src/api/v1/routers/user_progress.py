@@ -1,32 +1,70 @@
-from typing import List, Optional, Dict, Any
+from datetime import date, datetime
+from typing import List, Literal, Optional, Union, get_args
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from src.common.database import get_db
-from src.common.auth import get_current_user
+from src.common.auth import CurrentUser, get_current_user
+from src.common.cache import cached_response, invalidate_cache
 from src.modules.user_progress.services.progress_service import ProgressService
 from src.modules.user_progress.services.analytics_service import AnalyticsService
 
 router = APIRouter(prefix="/user-progress", tags=["User Progress"])
 
+ProgressItemType = Literal["course", "video", "assessment", "learning_path"]
+
+# Validated by FastAPI before the cached handler runs, so bad values never
+# start a cache fill
+ActivityMetric = Literal["daily_time", "weekly_completion", "monthly_assessments"]
+ActivityPeriod = Literal["7d", "30d", "90d", "365d"]
+
+# Dashboard aggregates are expensive and only change when the user records
+# progress; cache them briefly per user and drop them on every update
+PROGRESS_SUMMARY_CACHE_TTL_SECONDS = 60
+PROGRESS_ACTIVITY_CACHE_TTL_SECONDS = 60
+
+def _summary_cache_key(user_id: str) -> str:
+    return f"prog:sum:{user_id}"
+
+def _activity_cache_key(user_id: str, metric: str, period: str) -> str:
+    return f"prog:activity:{user_id}:{metric}:{period}"
+
+def _progress_cache_keys(user_id: str) -> List[str]:
+    """All cached aggregate keys of a user; the metric/period grid is small."""
+    return [_summary_cache_key(user_id)] + [
+        _activity_cache_key(user_id, metric, period)
+        for metric in get_args(ActivityMetric)
+        for period in get_args(ActivityPeriod)
+    ]
+
+# Dependency to get ProgressService
+def get_progress_service(db: AsyncSession = Depends(get_db)) -> ProgressService:
+    return ProgressService(db)
+
+# Dependency to get AnalyticsService
+def get_analytics_service(db: AsyncSession = Depends(get_db)) -> AnalyticsService:
+    return AnalyticsService(db)
+
 # Request/Response Models
 class ProgressRecord(BaseModel):
     """Progress record model."""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
     item_type: str
     item_id: UUID
     completion_percentage: int
     completed: bool
-    last_accessed_at: str
+    last_accessed_at: datetime
     time_spent_seconds: int
-    
-    class Config:
-        from_attributes = True
 
 class ProgressSummary(BaseModel):
     """User progress summary model."""
+    model_config = ConfigDict(frozen=True)
+    
     total_courses: int
     completed_courses: int
     total_videos: int
@@ -40,6 +78,8 @@ class ProgressSummary(BaseModel):
 
 class CourseProgressSummary(BaseModel):
     """Course progress summary model."""
+    model_config = ConfigDict(frozen=True)
+    
     course_id: UUID
     course_title: str
     completion_percentage: int
@@ -48,23 +88,29 @@ class CourseProgressSummary(BaseModel):
     completed_videos: int
     total_assessments: int
     completed_assessments: int
-    last_accessed_at: str
+    last_accessed_at: datetime
     time_spent_hours: float
 
+_course_progress_list_adapter = TypeAdapter(List[CourseProgressSummary])
+
 class LearningPathProgressSummary(BaseModel):
     """Learning path progress summary model."""
+    model_config = ConfigDict(frozen=True)
+    
     learning_path_id: UUID
     learning_path_title: str
     completion_percentage: int
     completed: bool
     total_items: int
     completed_items: int
-    last_accessed_at: str
+    last_accessed_at: datetime
     time_spent_hours: float
 
+_learning_path_progress_list_adapter = TypeAdapter(List[LearningPathProgressSummary])
+
 class ProgressUpdateRequest(BaseModel):
     """Progress update request model."""
-    item_type: str = Field(..., description="Type of item: 'course', 'video', 'assessment', 'learning_path'")
+    item_type: ProgressItemType = Field(..., description="Type of item: 'course', 'video', 'assessment', 'learning_path'")
     item_id: UUID
     completion_percentage: Optional[int] = Field(None, ge=0, le=100)
     completed: Optional[bool] = None
@@ -72,134 +118,108 @@ class ProgressUpdateRequest(BaseModel):
 
 class TimeSeriesPoint(BaseModel):
     """Time series data point."""
-    date: str
+    model_config = ConfigDict(frozen=True)
+    
+    date: Union[datetime, date]
     value: float
 
 class TimeSeriesData(BaseModel):
     """Time series data model."""
+    model_config = ConfigDict(frozen=True)
+    
     metric: str
     data: List[TimeSeriesPoint]
 
 # Routes
 @router.get("/summary", response_model=ProgressSummary)
+@cached_response(
+    ttl=PROGRESS_SUMMARY_CACHE_TTL_SECONDS,
+    key=lambda current_user, **_: _summary_cache_key(current_user["sub"])
+)
 async def get_progress_summary(
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
     Get user progress summary.
     
     Returns a summary of the user's overall progress across the platform.
+    Results are cached for up to a minute and refreshed on progress updates.
     """
-    analytics_service = AnalyticsService(db)
-    
     summary = await analytics_service.get_user_progress_summary(
-        user_id=UUID(current_user["sub"])
+        user_id=current_user["sub_uuid"]
     )
     
-    return ProgressSummary(
-        total_courses=summary["total_courses"],
-        completed_courses=summary["completed_courses"],
-        total_videos=summary["total_videos"],
-        completed_videos=summary["completed_videos"],
-        total_assessments=summary["total_assessments"],
-        completed_assessments=summary["completed_assessments"],
-        total_learning_paths=summary["total_learning_paths"],
-        completed_learning_paths=summary["completed_learning_paths"],
-        overall_completion_percentage=summary["overall_completion_percentage"],
-        total_time_spent_hours=summary["total_time_spent_hours"]
-    )
+    # Service results are trusted; skip validation
+    return ProgressSummary.model_construct(**summary)
 
-@router.get("/courses", response_model=List[CourseProgressSummary])
+@router.get("/courses", responses={200: {"model": List[CourseProgressSummary]}})
 async def get_course_progress(
     limit: int = Query(100, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
     Get user course progress.
     
     Returns a summary of the user's progress for each course they have accessed.
     """
-    analytics_service = AnalyticsService(db)
-    
     courses = await analytics_service.get_user_course_progress(
-        user_id=UUID(current_user["sub"]),
+        user_id=current_user["sub_uuid"],
         limit=limit,
         offset=offset
     )
     
-    return [
-        CourseProgressSummary(
-            course_id=course["course_id"],
-            course_title=course["course_title"],
-            completion_percentage=course["completion_percentage"],
-            completed=course["completed"],
-            total_videos=course["total_videos"],
-            completed_videos=course["completed_videos"],
-            total_assessments=course["total_assessments"],
-            completed_assessments=course["completed_assessments"],
-            last_accessed_at=course["last_accessed_at"].isoformat(),
-            time_spent_hours=course["time_spent_hours"]
-        ) for course in courses
-    ]
+    # Service results are trusted; skip validation and dump straight to bytes
+    return Response(
+        content=_course_progress_list_adapter.dump_json(
+            [CourseProgressSummary.model_construct(**course) for course in courses]
+        ),
+        media_type="application/json"
+    )
 
-@router.get("/learning-paths", response_model=List[LearningPathProgressSummary])
+@router.get("/learning-paths", responses={200: {"model": List[LearningPathProgressSummary]}})
 async def get_learning_path_progress(
     limit: int = Query(100, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
     Get user learning path progress.
     
     Returns a summary of the user's progress for each learning path they have enrolled in.
     """
-    analytics_service = AnalyticsService(db)
-    
     learning_paths = await analytics_service.get_user_learning_path_progress(
-        user_id=UUID(current_user["sub"]),
+        user_id=current_user["sub_uuid"],
         limit=limit,
         offset=offset
     )
     
-    return [
-        LearningPathProgressSummary(
-            learning_path_id=path["learning_path_id"],
-            learning_path_title=path["learning_path_title"],
-            completion_percentage=path["completion_percentage"],
-            completed=path["completed"],
-            total_items=path["total_items"],
-            completed_items=path["completed_items"],
-            last_accessed_at=path["last_accessed_at"].isoformat(),
-            time_spent_hours=path["time_spent_hours"]
-        ) for path in learning_paths
-    ]
+    # Service results are trusted; skip validation and dump straight to bytes
+    return Response(
+        content=_learning_path_progress_list_adapter.dump_json(
+            [LearningPathProgressSummary.model_construct(**path) for path in learning_paths]
+        ),
+        media_type="application/json"
+    )
 
 @router.get("/items/{item_type}/{item_id}", response_model=ProgressRecord)
 async def get_item_progress(
-    item_type: str = Path(..., description="Type of item: 'course', 'video', 'assessment', 'learning_path'"),
+    item_type: ProgressItemType = Path(..., description="Type of item: 'course', 'video', 'assessment', 'learning_path'"),
     item_id: UUID = Path(..., description="ID of the item"),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    progress_service: ProgressService = Depends(get_progress_service)
 ):
     """
     Get progress for a specific item.
     
     Returns the user's progress for a specific course, video, assessment, or learning path.
     """
-    progress_service = ProgressService(db)
-    
-    if item_type not in ["course", "video", "assessment", "learning_path"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid item type. Must be one of: 'course', 'video', 'assessment', 'learning_path'"
-        )
-    
     progress = await progress_service.get_item_progress(
-        user_id=UUID(current_user["sub"]),
+        user_id=current_user["sub_uuid"],
         item_type=item_type,
         item_id=item_id
     )
@@ -210,43 +230,29 @@ async def get_item_progress(
             detail=f"No progress found for {item_type} with ID {item_id}"
         )
     
-    return ProgressRecord(
-        item_type=progress.item_type,
-        item_id=progress.item_id,
-        completion_percentage=progress.completion_percentage,
-        completed=progress.completed,
-        last_accessed_at=progress.last_accessed_at.isoformat(),
-        time_spent_seconds=progress.time_spent_seconds
-    )
+    return progress
 
 @router.post("/update", status_code=status.HTTP_204_NO_CONTENT)
 async def update_progress(
     progress_data: ProgressUpdateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    progress_service: ProgressService = Depends(get_progress_service)
 ):
     """
     Update progress for an item.
     
     Updates the user's progress for a specific course, video, assessment, or learning path.
     """
-    progress_service = ProgressService(db)
-    
-    if progress_data.item_type not in ["course", "video", "assessment", "learning_path"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid item type. Must be one of: 'course', 'video', 'assessment', 'learning_path'"
-        )
-    
     try:
         await progress_service.update_progress(
-            user_id=UUID(current_user["sub"]),
+            user_id=current_user["sub_uuid"],
             item_type=progress_data.item_type,
             item_id=progress_data.item_id,
             completion_percentage=progress_data.completion_percentage,
             completed=progress_data.completed,
             time_spent_seconds=progress_data.time_spent_seconds
         )
+        await invalidate_cache(*_progress_cache_keys(current_user["sub"]))
         return None
     except ValueError as e:
         raise HTTPException(
@@ -255,45 +261,30 @@ async def update_progress(
         )
 
 @router.get("/activity", response_model=TimeSeriesData)
+@cached_response(
+    ttl=PROGRESS_ACTIVITY_CACHE_TTL_SECONDS,
+    key=lambda current_user, metric, period, **_: _activity_cache_key(current_user["sub"], metric, period)
+)
 async def get_activity_data(
-    metric: str = Query(..., description="Metric to retrieve: 'daily_time', 'weekly_completion', 'monthly_assessments'"),
-    period: str = Query("30d", description="Time period: '7d', '30d', '90d', '365d'"),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    metric: ActivityMetric = Query(..., description="Metric to retrieve: 'daily_time', 'weekly_completion', 'monthly_assessments'"),
+    period: ActivityPeriod = Query("30d", description="Time period: '7d', '30d', '90d', '365d'"),
+    current_user: CurrentUser = Depends(get_current_user),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ):
     """
     Get user activity time series data.
     
-    Returns time series data for various activity metrics.
+    Returns time series data for various activity metrics. Results are
+    cached for up to a minute and refreshed on progress updates.
     """
-    analytics_service = AnalyticsService(db)
-    
-    valid_metrics = ["daily_time", "weekly_completion", "monthly_assessments"]
-    if metric not in valid_metrics:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid metric. Must be one of: {', '.join(valid_metrics)}"
-        )
-    
-    valid_periods = ["7d", "30d", "90d", "365d"]
-    if period not in valid_periods:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid period. Must be one of: {', '.join(valid_periods)}"
-        )
-    
     time_series = await analytics_service.get_user_activity_time_series(
-        user_id=UUID(current_user["sub"]),
+        user_id=current_user["sub_uuid"],
         metric=metric,
         period=period
     )
     
     return TimeSeriesData(
         metric=metric,
-        data=[
-            TimeSeriesPoint(
-                date=point["date"].isoformat(),
-                value=point["value"]
-            ) for point in time_series
-        ]
+        data=time_series
     )
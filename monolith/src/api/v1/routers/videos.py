@@ -1,18 +1,30 @@
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Path, Request
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, ConfigDict, HttpUrl, Field, TypeAdapter
 
 from src.common.database import get_db
 from src.common.auth import get_current_user
+from src.common.responses import etag_matches, http_date, not_modified, not_modified_since, weak_etag
 from src.modules.video.services.video_service import VideoService
 from src.modules.video.services.video_upload_service import VideoUploadService
 from src.modules.video.services.video_streaming_service import VideoStreamingService
 
 router = APIRouter(prefix="/videos", tags=["Videos"])
 
+# Uploads are passed to storage in bounded chunks so memory use per upload
+# does not grow with the file size
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+async def _iter_upload_chunks(upload: UploadFile) -> AsyncIterator[bytes]:
+    """Yield an uploaded file's content in UPLOAD_CHUNK_SIZE pieces."""
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
 # Request/Response Models
 class VideoBase(BaseModel):
     """Base video model."""
@@ -34,14 +46,15 @@ class VideoUpdateRequest(BaseModel):
 
 class VideoResponse(VideoBase):
     """Video response model."""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: UUID
     status: str
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
     streaming_url: Optional[HttpUrl] = None
-    
-    class Config:
-        from_attributes = True
+
+_video_list_adapter = TypeAdapter(List[VideoResponse])
 
 class VideoPlaybackInfo(BaseModel):
     """Video playback information."""
@@ -76,25 +89,14 @@ async def create_video(
             created_by=UUID(current_user["sub"])
         )
         
-        return VideoResponse(
-            id=video.id,
-            title=video.title,
-            description=video.description,
-            duration_seconds=video.duration_seconds,
-            thumbnail_url=video.thumbnail_url,
-            course_id=video.course_id,
-            status=video.status,
-            streaming_url=video.streaming_url,
-            created_at=video.created_at.isoformat(),
-            updated_at=video.updated_at.isoformat()
-        )
+        return video
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
-@router.get("", response_model=List[VideoResponse])
+@router.get("", responses={200: {"model": List[VideoResponse]}})
 async def list_videos(
     course_id: Optional[UUID] = Query(None, description="Filter by course ID"),
     limit: int = Query(100, ge=1, le=100),
@@ -114,23 +116,17 @@ async def list_videos(
         offset=offset
     )
     
-    return [
-        VideoResponse(
-            id=video.id,
-            title=video.title,
-            description=video.description,
-            duration_seconds=video.duration_seconds,
-            thumbnail_url=video.thumbnail_url,
-            course_id=video.course_id,
-            status=video.status,
-            streaming_url=video.streaming_url,
-            created_at=video.created_at.isoformat(),
-            updated_at=video.updated_at.isoformat()
-        ) for video in videos
-    ]
+    # One compiled validator pass over all rows, dumped straight to JSON bytes
+    return Response(
+        content=_video_list_adapter.dump_json(
+            _video_list_adapter.validate_python(videos, from_attributes=True)
+        ),
+        media_type="application/json"
+    )
 
-@router.get("/{video_id}", response_model=VideoResponse)
+@router.get("/{video_id}", responses={200: {"model": VideoResponse}})
 async def get_video(
+    request: Request,
     video_id: UUID = Path(..., description="The ID of the video to retrieve"),
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -138,7 +134,8 @@ async def get_video(
     """
     Get a specific video by ID.
     
-    Returns the video data for a single video.
+    Returns the video data for a single video. Supports conditional requests
+    through ETag/If-None-Match and Last-Modified/If-Modified-Since.
     """
     video_service = VideoService(db)
     video = await video_service.get_video(video_id)
@@ -149,17 +146,20 @@ async def get_video(
             detail="Video not found"
         )
     
-    return VideoResponse(
-        id=video.id,
-        title=video.title,
-        description=video.description,
-        duration_seconds=video.duration_seconds,
-        thumbnail_url=video.thumbnail_url,
-        course_id=video.course_id,
-        status=video.status,
-        streaming_url=video.streaming_url,
-        created_at=video.created_at.isoformat(),
-        updated_at=video.updated_at.isoformat()
+    # Skip serialization when the client's cached copy is still current
+    etag = weak_etag(video.id, video.updated_at)
+    last_modified = http_date(video.updated_at)
+    if etag_matches(request, etag) or (
+        "if-none-match" not in request.headers and not_modified_since(request, video.updated_at)
+    ):
+        response = not_modified(etag)
+        response.headers["Last-Modified"] = last_modified
+        return response
+    
+    return Response(
+        content=VideoResponse.model_validate(video).model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": etag, "Last-Modified": last_modified}
     )
 
 @router.put("/{video_id}", response_model=VideoResponse)
@@ -191,18 +191,7 @@ async def update_video(
                 detail="Video not found"
             )
         
-        return VideoResponse(
-            id=video.id,
-            title=video.title,
-            description=video.description,
-            duration_seconds=video.duration_seconds,
-            thumbnail_url=video.thumbnail_url,
-            course_id=video.course_id,
-            status=video.status,
-            streaming_url=video.streaming_url,
-            created_at=video.created_at.isoformat(),
-            updated_at=video.updated_at.isoformat()
-        )
+        return video
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -245,28 +234,20 @@ async def upload_video_content(
     Upload video content.
     
     Uploads the actual video file content for a video that has already been created.
+    The file is streamed to storage in chunks rather than read into memory.
     """
     upload_service = VideoUploadService(db)
     
     try:
-        video = await upload_service.upload_video(
+        video = await upload_service.upload_video_stream(
             video_id=video_id,
-            file=video_file,
+            chunks=_iter_upload_chunks(video_file),
+            filename=video_file.filename,
+            content_type=video_file.content_type,
             uploaded_by=UUID(current_user["sub"])
         )
         
-        return VideoResponse(
-            id=video.id,
-            title=video.title,
-            description=video.description,
-            duration_seconds=video.duration_seconds,
-            thumbnail_url=video.thumbnail_url,
-            course_id=video.course_id,
-            status=video.status,
-            streaming_url=video.streaming_url,
-            created_at=video.created_at.isoformat(),
-            updated_at=video.updated_at.isoformat()
-        )
+        return video
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -54,6 +54,8 @@ class LessonProgressInCourse(BaseModel):
     last_position_seconds: Optional[int] = None
     
     class Config:
+        # Validated straight from the service's lesson row dataclasses
+        from_attributes = True
         schema_extra = {
             "example": {
                 "lesson_id": "550e8400-e29b-41d4-a716-446655440000",
@@ -1,34 +1,82 @@
+import asyncio
+import functools
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, FrozenSet, NotRequired, TypedDict, Union, List
+from uuid import UUID
 
+import bcrypt
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.common.config import get_settings
 from src.common.database import get_db
 from src.common.logger import get_logger
 from src.modules.auth.persistence.user_repository import UserRepository
-from src.modules.identity.persistence.profile_repository import ProfileRepository
+from src.modules.identity.services.authorization_service import AuthorizationService
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # OAuth2 scheme for token extraction from requests
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/api/v1/auth/token")
+# Same, but yields None instead of a 401 when no token is sent
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/api/v1/auth/token", auto_error=False)
+
+# Verified tokens and their users are remembered briefly per process so
+# repeat requests skip the JWT signature check and the user lookup. Entries
+# are keyed by the whole token and never outlive its "exp"; the short TTL
+# bounds how long a deactivated account keeps working in a worker.
+_TOKEN_CACHE_TTL_SECONDS = 60
+
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=_TOKEN_CACHE_TTL_SECONDS)
+
+class CurrentUser(TypedDict):
+    """User dict returned by get_current_user."""
+    id: str
+    email: str
+    first_name: str
+    last_name: str
+    is_active: bool
+    is_verified: bool
+    created_at: Optional[str]
+    updated_at: Optional[str]
+    last_login_at: Optional[str]
+    sub: str
+    sub_uuid: UUID
+    is_admin: NotRequired[bool]
+
+@dataclass(frozen=True, slots=True)
+class AuthUser:
+    """
+    Authenticated user as seen by request handlers.
+    
+    Roles and permissions are only populated by
+    get_current_user_with_permissions; elsewhere they are empty.
+    """
+    id: str
+    sub_uuid: UUID
+    email: str
+    is_admin: bool = False
+    roles: FrozenSet[str] = frozenset()
+    permissions: FrozenSet[str] = frozenset()
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# bcrypt is deliberately slow, so hashing runs in a worker thread to keep the
+# event loop serving other requests meanwhile
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify that a plain password matches the hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return await asyncio.to_thread(
+        bcrypt.checkpw, plain_password.encode(), hashed_password.encode()
+    )
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """Hash a password for storing."""
-    return pwd_context.hash(password)
+    password_hash = await asyncio.to_thread(bcrypt.hashpw, password.encode(), bcrypt.gensalt())
+    return password_hash.decode()
 
 def create_access_token(
     data: Dict[str, Any], 
@@ -47,16 +95,32 @@ def create_access_token(
     
     return encoded_jwt
 
+@functools.lru_cache(maxsize=4096)
+def _parse_subject(sub: str) -> UUID:
+    """
+    Parse a token subject into a UUID.
+
+    Each worker sees the same active users again and again, so parsed
+    subjects are memoized; invalid subjects raise ValueError every time.
+    """
+    return UUID(sub)
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> CurrentUser:
     """
     Get the current user from the token.
     
     Validates the JWT token and returns the user data.
     Raises HTTPException if validation fails.
     """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        expires_at, cached_user = cached
+        if time.time() < expires_at:
+            return dict(cached_user)
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -75,6 +139,12 @@ async def get_current_user(
         if user_id is None:
             raise credentials_exception
         
+        # Parse the subject once here so handlers don't re-parse it per call
+        try:
+            user_uuid = _parse_subject(user_id)
+        except ValueError:
+            raise credentials_exception
+        
         # Get the user from the database
         user_repo = UserRepository(db)
         user = await user_repo.get_by_id(user_id)
@@ -88,36 +158,60 @@ async def get_current_user(
                 detail="Inactive user account"
             )
         
-        return user.to_dict()
+        user_data = user.to_dict()
+        user_data["sub"] = user_id
+        user_data["sub_uuid"] = user_uuid
+        
+        _token_cache[token] = (
+            payload.get("exp", time.time() + _TOKEN_CACHE_TTL_SECONDS),
+            dict(user_data)
+        )
+        return user_data
         
     except JWTError:
         logger.warning("Invalid JWT token", extra={"props": {"token": token}})
         raise credentials_exception
 
+async def get_auth_user(
+    user: Dict[str, Any] = Depends(get_current_user)
+) -> AuthUser:
+    """Get the current user as an AuthUser."""
+    return AuthUser(
+        id=user["id"],
+        sub_uuid=user["sub_uuid"],
+        email=user["email"],
+        is_admin=bool(user.get("is_admin"))
+    )
+
 async def get_current_user_with_permissions(
     user: Dict[str, Any] = Depends(get_current_user),
     required_permissions: Optional[List[str]] = None,
     db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
+) -> AuthUser:
     """
-    Get the current user and check they have the required permissions.
+    Get the current user with their roles and permissions loaded.
     
-    If no permissions are required, just returns the user.
+    The returned AuthUser carries "roles" and "permissions" frozensets so
+    handlers can do in-process membership checks. If permissions are
+    required, the user must have all of them (or the admin role).
     """
-    if not required_permissions:
-        return user
-    
-    # Get user's profile with roles and permissions
-    profile_repo = ProfileRepository(db)
-    user_permissions = await profile_repo.get_user_permissions(user["id"])
+    # Roles and permissions come from the authorization service's L1/L2 cache
+    roles, permissions = await AuthorizationService(db).get_access(user["id"])
+    auth_user = AuthUser(
+        id=user["id"],
+        sub_uuid=user["sub_uuid"],
+        email=user["email"],
+        is_admin="admin" in roles or bool(user.get("is_admin")),
+        roles=roles,
+        permissions=permissions
+    )
     
-    # Check if user has admin role (which grants all permissions)
-    if "admin" in user_permissions.get("roles", []):
-        return user
+    if not required_permissions or auth_user.is_admin:
+        return auth_user
     
     # Check specific permissions
     for required_perm in required_permissions:
-        if required_perm not in user_permissions.get("permissions", []):
+        if required_perm not in permissions:
             logger.warning(
                 f"User {user['id']} attempted to access a resource requiring {required_perm} permission",
                 extra={"props": {"user_id": user["id"], "required_permission": required_perm}}
@@ -127,6 +221,24 @@ async def get_current_user_with_permissions(
                 detail="Not enough permissions"
             )
     
+    return auth_user
+
+async def get_current_admin_user(
+    user: CurrentUser = Depends(get_current_user),
+    auth_user: AuthUser = Depends(get_current_user_with_permissions)
+) -> CurrentUser:
+    """
+    Get the current user if they have the admin role.
+    
+    The role comes from AuthorizationService's cached role lookup; tokens and
+    user records carry no admin flag.
+    """
+    if "admin" not in auth_user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator privileges required"
+        )
+    
     return user
 
 def is_admin(
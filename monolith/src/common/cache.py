@@ -0,0 +1,209 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import orjson
+import redis.asyncio as redis
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from src.common.config import get_settings
+from src.common.logger import get_logger
+from src.common.responses import etag_matches, not_modified, payload_etag
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Shared Redis client for application-level caches
+_cache_client: Optional[redis.Redis] = None
+
+# On a miss, one request per key recomputes the body while concurrent
+# requests poll briefly for its result instead of all hitting the database.
+# The holder releases the lock as soon as its fill ends, successful or not;
+# the TTL only reclaims locks of workers that died mid-fill. Waiters stop
+# polling after about a second, well within the TTL, so a slow fill delays
+# other requests by at most that much before they compute the body themselves.
+_FILL_LOCK_TTL_SECONDS = 5
+_FILL_WAIT_INTERVAL_SECONDS = 0.05
+_FILL_WAIT_ATTEMPTS = 20
+
+# Fills in progress in this process, so concurrent misses on the same key
+# share one computation without a Redis round trip
+_inflight_fills: Dict[str, "asyncio.Future[Optional[bytes]]"] = {}
+
+def get_cache() -> redis.Redis:
+    """
+    Get the shared Redis client used for caching.
+
+    The client is created lazily and reuses a single connection pool for the
+    whole process. Values are returned as raw bytes so callers can store JSON
+    or binary payloads without an extra decode step.
+    """
+    global _cache_client
+    if _cache_client is None:
+        _cache_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _cache_client
+
+async def close_cache() -> None:
+    """Close the shared Redis client when the application shuts down."""
+    global _cache_client
+    if _cache_client is not None:
+        await _cache_client.close()
+        _cache_client = None
+
+async def get_cached(key: str) -> Optional[bytes]:
+    """
+    Get a cache entry.
+
+    Redis failures are logged and treated as a miss.
+    """
+    try:
+        return await get_cache().get(key)
+    except RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {str(e)}")
+        return None
+
+async def set_cached(key: str, value: bytes, ttl: int) -> None:
+    """
+    Store a cache entry with a TTL.
+
+    Redis failures are logged and otherwise ignored.
+    """
+    try:
+        await get_cache().setex(key, ttl, value)
+    except RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {str(e)}")
+
+async def invalidate_cache(*keys: str) -> None:
+    """
+    Delete cached entries.
+
+    Redis failures are logged; the entries then expire through their TTL.
+    """
+    try:
+        await get_cache().delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache invalidation failed for {keys}: {str(e)}")
+
+def render_payload(result: Any) -> bytes:
+    """
+    Render a handler result to the JSON bytes stored by cached_response.
+
+    Bytes are taken as already rendered JSON. Pydantic models are serialized
+    by pydantic-core straight to bytes; other results go through
+    jsonable_encoder and orjson.
+    """
+    if isinstance(result, bytes):
+        return result
+    if isinstance(result, BaseModel):
+        return result.model_dump_json(by_alias=True).encode()
+    return orjson.dumps(jsonable_encoder(result))
+
+async def _acquire_fill_lock(key: str) -> bool:
+    """Claim the right to fill a cache entry; True on Redis failures."""
+    try:
+        return bool(await get_cache().set(f"{key}:lock", b"1", nx=True, ex=_FILL_LOCK_TTL_SECONDS))
+    except RedisError as e:
+        logger.warning(f"Cache fill lock failed for {key}: {str(e)}")
+        return True
+
+async def refresh_periodically(interval: float, refresh: Callable[[], Awaitable[None]]) -> None:
+    """
+    Run a cache refresh now and then every ``interval`` seconds until cancelled.
+
+    Failures are logged and retried on the next run.
+    """
+    while True:
+        try:
+            await refresh()
+        except Exception as e:
+            logger.error(f"Cache refresh {refresh.__name__} failed: {str(e)}", exc_info=True)
+        await asyncio.sleep(interval)
+
+def cached_response(
+    ttl: int,
+    key: Callable[..., str],
+    cache_control: Optional[str] = None
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Response]]]:
+    """
+    Cache a GET handler's JSON body in Redis and answer revalidations with 304.
+
+    The handler must declare a ``request: Request`` parameter. ``key`` is
+    called with the handler's keyword arguments and returns the cache key.
+    The rendered JSON bytes are cached, so hits never build models. On a miss
+    only one request recomputes the body; concurrent ones in the same process
+    await its result, and those in other processes briefly poll Redis for it.
+    The body is served with a strong ETag; a matching If-None-Match gets an
+    empty 304. A handler that returns a Response opts out: it is sent as is
+    and nothing is cached. Redis failures are logged and treated as cache
+    misses.
+
+    Args:
+        ttl: Time to live of cached bodies in seconds
+        key: Builds the cache key from the handler's keyword arguments
+        cache_control: Cache-Control header value, so clients can reuse the
+            body without revalidating
+
+    Returns:
+        Decorator for the handler
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Response]]:
+        @functools.wraps(func)
+        async def wrapper(**kwargs: Any) -> Response:
+            request: Request = kwargs["request"]
+            cache_key = key(**kwargs)
+            
+            payload = await get_cached(cache_key)
+            
+            if payload is None and cache_key in _inflight_fills:
+                # Resolves to None if that fill fails; we then try ourselves
+                payload = await asyncio.shield(_inflight_fills[cache_key])
+            
+            holds_lock = False
+            if payload is None:
+                holds_lock = await _acquire_fill_lock(cache_key)
+                if not holds_lock:
+                    # Another request is filling this entry; wait for its result
+                    for _ in range(_FILL_WAIT_ATTEMPTS):
+                        await asyncio.sleep(_FILL_WAIT_INTERVAL_SECONDS)
+                        payload = await get_cached(cache_key)
+                        if payload is not None:
+                            break
+            
+            if payload is None:
+                fill: "asyncio.Future[Optional[bytes]]" = asyncio.get_running_loop().create_future()
+                _inflight_fills[cache_key] = fill
+                try:
+                    result = await func(**kwargs)
+                    if isinstance(result, Response):
+                        # Not cacheable; waiters resolve to None and run the
+                        # handler themselves
+                        return result
+                    payload = render_payload(result)
+                finally:
+                    if _inflight_fills.get(cache_key) is fill:
+                        del _inflight_fills[cache_key]
+                    fill.set_result(payload)
+                    if payload is None and holds_lock:
+                        # Nothing was cached; let the next request retry at once
+                        await invalidate_cache(f"{cache_key}:lock")
+                await set_cached(cache_key, payload, ttl)
+                if holds_lock:
+                    await invalidate_cache(f"{cache_key}:lock")
+            
+            etag = payload_etag(payload)
+            if etag_matches(request, etag):
+                response = not_modified(etag)
+            else:
+                response = Response(content=payload, media_type="application/json", headers={"ETag": etag})
+            
+            if cache_control:
+                response.headers["Cache-Control"] = cache_control
+            return response
+        
+        return wrapper
+    
+    return decorator
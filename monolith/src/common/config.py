@@ -12,8 +12,19 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: PostgresDsn = Field(..., env="DATABASE_URL")
-    DB_POOL_SIZE: int = Field(default=5, env="DB_POOL_SIZE")
-    DB_MAX_OVERFLOW: int = Field(default=10, env="DB_MAX_OVERFLOW")
+    DB_POOL_SIZE: int = Field(default=20, env="DB_POOL_SIZE")
+    # Burst headroom on top of the pool; concurrent fan-outs such as the
+    # recommendations feed check out several connections per request
+    DB_MAX_OVERFLOW: int = Field(default=40, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: int = Field(default=10, env="DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: int = Field(default=1800, env="DB_POOL_RECYCLE")
+    # Set when connecting through pgbouncer in transaction mode, which does
+    # the pooling itself
+    DB_USE_NULL_POOL: bool = Field(default=False, env="DB_USE_NULL_POOL")
+    # SQLAlchemy compiled-statement LRU and asyncpg per-connection prepared
+    # statement cache sizes
+    DB_QUERY_CACHE_SIZE: int = Field(default=1200, env="DB_QUERY_CACHE_SIZE")
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = Field(default=500, env="DB_PREPARED_STATEMENT_CACHE_SIZE")
     
     # Security
     SECRET_KEY: str = Field(..., env="SECRET_KEY")
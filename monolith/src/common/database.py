@@ -1,8 +1,10 @@
 import logging
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from src.common.config import get_settings
 
@@ -11,12 +13,45 @@ Base = declarative_base()
 
 # Create async engine
 settings = get_settings()
+if settings.DB_USE_NULL_POOL:
+    # pgbouncer owns the pool; avoid double pooling. Server-side prepared
+    # statements don't survive transaction-mode pooling, so stop caching them.
+    # The dialect still prepares each statement, and asyncpg's generated
+    # __asyncpg_stmt_N__ names collide across the clients pgbouncer multiplexes
+    # onto one server connection, so every statement gets a unique name too.
+    _pool_options = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+else:
+    _pool_options = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        # Hot queries are prepared once per pooled connection and reused
+        "connect_args": {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE},
+    }
+
+def _async_database_url(url: str) -> str:
+    """Force the asyncpg driver for plain postgres:// or postgresql:// URLs."""
+    for prefix in ("postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
 async_engine = create_async_engine(
-    str(settings.DATABASE_URL),
+    _async_database_url(str(settings.DATABASE_URL)),
     echo=settings.DEBUG,
     future=True,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    **_pool_options,
 )
 
 # Create async session factory
@@ -28,6 +63,26 @@ AsyncSessionLocal = sessionmaker(
     autoflush=False,
 )
 
+def get_pool_status() -> Dict[str, Any]:
+    """
+    Get the connection pool's current usage.
+    
+    Returns:
+        Dictionary with the pool class, its status line and, for queue
+        pools, the size, checked-out and overflow connection counts
+    """
+    pool = async_engine.pool
+    status = {"pool_class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=settings.DB_MAX_OVERFLOW
+        )
+    return status
+
 async def init_db():
     """Initialize database when application starts."""
     try:
@@ -54,11 +109,8 @@ async def close_db():
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get a database session for dependency injection."""
-    session = AsyncSessionLocal()
-    try:
+    async with AsyncSessionLocal() as session:
         yield session
-    finally:
-        await session.close()
 
 # For synchronous code if needed (rarely used)
 def get_sync_db():
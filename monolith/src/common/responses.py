@@ -0,0 +1,147 @@
+import functools
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+from fastapi import Request, status
+from fastapi.responses import Response
+
+class ORJSONResponse(Response):
+    """
+    JSON response rendered with orjson.
+
+    UUIDs and datetimes are serialized natively by orjson (naive datetimes are
+    treated as UTC), and any other unsupported type such as Decimal falls back
+    to ``str``. Returning this directly from a handler also skips FastAPI's
+    ``jsonable_encoder`` pass.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NAIVE_UTC)
+
+def weak_etag(entity_id: Any, updated_at: Optional[datetime]) -> str:
+    """
+    Build a weak ETag from an entity's ID and last modification time.
+
+    Args:
+        entity_id: Entity ID
+        updated_at: Last modification time, or None if never updated
+
+    Returns:
+        Weak ETag header value
+    """
+    version = int(updated_at.timestamp() * 1_000_000) if updated_at else 0
+    return f'W/"{entity_id}-{version}"'
+
+def payload_etag(payload: bytes) -> str:
+    """
+    Build a strong ETag from a serialized response body.
+
+    Args:
+        payload: Response body bytes
+
+    Returns:
+        Strong ETag header value
+    """
+    return f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches an ETag.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's cached copy is still current, False otherwise
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 response carrying the resource's ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+def http_date(value: datetime) -> str:
+    """Format a timestamp (naive values are UTC) as an HTTP date header value."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value, usegmt=True)
+
+def not_modified_since(request: Request, last_modified: datetime) -> bool:
+    """
+    Check whether the request's If-Modified-Since covers a modification time.
+    
+    Args:
+        request: Incoming request
+        last_modified: When the resource last changed (naive values are UTC)
+    
+    Returns:
+        True if the client's cached copy is at least as recent, False otherwise
+    """
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    try:
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+def conditional_on_last_modified(
+    get_last_modified: Callable[..., Awaitable[Optional[datetime]]]
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """
+    Answer If-Modified-Since revalidations of a GET handler with 304.
+
+    ``get_last_modified`` is awaited with the handler's keyword arguments and
+    returns when the underlying data last changed (naive values are UTC). If
+    the client's copy is at least that recent, the handler is skipped and an
+    empty 304 is returned. Requests that also send If-None-Match are left to
+    the ETag check. Otherwise the handler runs and Last-Modified is set
+    on the Response it returns, or on its injected ``response`` parameter.
+    The handler must declare a ``request: Request`` parameter.
+
+    Args:
+        get_last_modified: Looks up the last modification time
+
+    Returns:
+        Decorator for the handler
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(**kwargs: Any) -> Any:
+            last_modified = await get_last_modified(**kwargs)
+            if last_modified is None:
+                return await func(**kwargs)
+            
+            header = http_date(last_modified)
+            # If-None-Match takes precedence; If-Modified-Since is then ignored
+            # (RFC 9110, section 13.1.3)
+            request: Request = kwargs["request"]
+            if "if-none-match" not in request.headers and not_modified_since(request, last_modified):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"Last-Modified": header}
+                )
+            
+            result = await func(**kwargs)
+            if isinstance(result, Response):
+                result.headers["Last-Modified"] = header
+            elif isinstance(kwargs.get("response"), Response):
+                kwargs["response"].headers["Last-Modified"] = header
+            return result
+        
+        return wrapper
+    
+    return decorator
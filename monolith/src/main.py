@@ -1,9 +1,16 @@
+import asyncio
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.openapi.utils import get_openapi
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
 
 from src.common.config import get_settings
+from src.common.cache import get_cache, close_cache, refresh_periodically
 from src.common.database import init_db, close_db
+from src.common.responses import ORJSONResponse
 from src.common.logger import setup_logging
 from src.api.v1.routers import (
     auth, identity, courses, videos, assessments, learning_paths,
@@ -15,7 +22,8 @@ from src.api.v1.routers.admin import dashboard, users, courses as admin_courses,
 app = FastAPI(
     title="E-Learning Platform API",
     description="Modular monolith API for the E-Learning Platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Setup logging
@@ -30,14 +38,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (list endpoints); small responses are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Global caches refreshed in the background, well within their TTLs
+POPULAR_SEARCHES_REFRESH_SECONDS = 120
+_background_tasks: set = set()
+
 # Event handlers
 @app.on_event("startup")
 async def startup_event():
     await init_db()
+    FastAPICache.init(RedisBackend(get_cache()), prefix="elephant")
+    _background_tasks.add(asyncio.create_task(
+        refresh_periodically(POPULAR_SEARCHES_REFRESH_SECONDS, search.warm_popular_searches_cache)
+    ))
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
     await close_db()
+    await close_cache()
 
 # Include routers
 app.include_router(auth.router, prefix="/api/v1", tags=["Authentication"])
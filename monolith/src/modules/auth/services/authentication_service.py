@@ -46,7 +46,7 @@ class AuthenticationService:
             logger.warning(f"Authentication attempt with inactive account: {email}")
             return None
         
-        if not verify_password(password, user.password_hash):
+        if not await verify_password(password, user.password_hash):
             logger.warning(f"Failed authentication attempt for user: {email}")
             return None
         
@@ -140,7 +140,7 @@ class AuthenticationService:
                 raise ValueError("User not found")
             
             # Update password
-            password_hash = get_password_hash(new_password)
+            password_hash = await get_password_hash(new_password)
             await self.user_repository.update_password(user_id, password_hash)
             
             # Mark token as used
@@ -171,12 +171,12 @@ class AuthenticationService:
             raise ValueError("User not found")
         
         # Verify current password
-        if not verify_password(current_password, user.password_hash):
+        if not await verify_password(current_password, user.password_hash):
             logger.warning(f"Failed password change attempt for user: {user.email}")
             raise ValueError("Current password is incorrect")
         
         # Update password
-        password_hash = get_password_hash(new_password)
+        password_hash = await get_password_hash(new_password)
         await self.user_repository.update_password(user_id, password_hash)
         
         logger.info(f"Password changed successfully for user: {user.email}")
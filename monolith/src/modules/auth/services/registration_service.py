@@ -56,7 +56,7 @@ class RegistrationService:
         # Create new user
         user_id = str(uuid.uuid4())
         now = datetime.utcnow()
-        password_hash = get_password_hash(password)
+        password_hash = await get_password_hash(password)
         
         user = User(
             id=user_id,
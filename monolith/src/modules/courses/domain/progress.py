@@ -94,4 +94,33 @@ class LessonProgress:
     def record_activity(self):
         """Record user activity in the lesson."""
         self.last_activity_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow() 
\ No newline at end of file
+        self.updated_at = datetime.utcnow()
+
+
+@dataclass(frozen=True, slots=True)
+class SectionLessonRow:
+    """
+    Read-only row of a lesson with a user's progress, as shown in section views.
+    """
+    lesson_id: str
+    title: str
+    type: str
+    status: str
+    progress_percentage: float
+    last_position_seconds: int
+
+
+@dataclass(frozen=True, slots=True)
+class CourseLessonRow:
+    """
+    Read-only row of a lesson with a user's progress and its section, as shown
+    in course views. Lesson fields are None for a section without lessons.
+    """
+    section_id: str
+    section_title: str
+    lesson_id: Optional[str]
+    title: Optional[str]
+    type: Optional[str]
+    status: str
+    progress_percentage: float
+    last_position_seconds: int
@@ -37,8 +37,10 @@ class CourseModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
-    # Relationships
-    sections = relationship("SectionModel", back_populates="course", cascade="all, delete-orphan")
+    # Relationships. The course -> sections -> lessons -> progress chain must be
+    # loaded explicitly (selectinload or a projection query); implicit lazy
+    # loads raise instead of issuing one query per row.
+    sections = relationship("SectionModel", back_populates="course", cascade="all, delete-orphan", lazy="raise")
     enrollments = relationship("EnrollmentModel", back_populates="course", cascade="all, delete-orphan")
     reviews = relationship("ReviewModel", back_populates="course", cascade="all, delete-orphan")
     
@@ -70,7 +72,7 @@ class SectionModel(Base):
     
     # Relationships
     course = relationship("CourseModel", back_populates="sections")
-    lessons = relationship("LessonModel", back_populates="section", cascade="all, delete-orphan")
+    lessons = relationship("LessonModel", back_populates="section", cascade="all, delete-orphan", lazy="raise")
     
     # Indices
     __table_args__ = (
@@ -103,7 +105,7 @@ class LessonModel(Base):
     
     # Relationships
     section = relationship("SectionModel", back_populates="lessons")
-    progress_records = relationship("LessonProgressModel", back_populates="lesson", cascade="all, delete-orphan")
+    progress_records = relationship("LessonProgressModel", back_populates="lesson", cascade="all, delete-orphan", lazy="raise")
     
     # Indices
     __table_args__ = (
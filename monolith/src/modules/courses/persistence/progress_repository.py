@@ -1,17 +1,39 @@
 import uuid
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from sqlalchemy import select, update, delete, func, desc, asc, and_
+from sqlalchemy import select, update, delete, func, desc, asc, and_, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.common.logger import get_logger
-from src.modules.courses.domain.progress import LessonProgress, ProgressStatus
+from src.modules.courses.domain.progress import (
+    CourseLessonRow, LessonProgress, ProgressStatus, SectionLessonRow
+)
 from src.modules.courses.models.course import LessonProgressModel
 
 logger = get_logger(__name__)
 
+# Every lesson of a course with a user's progress, sorted by section then
+# lesson position; sections without lessons yield one row of NULL lesson fields
+_COURSE_LESSON_PROGRESS_QUERY = text("""
+    SELECT
+        s.id AS section_id,
+        s.title AS section_title,
+        l.id AS lesson_id,
+        l.title,
+        l.type,
+        COALESCE(lp.status, 'not_started') AS status,
+        COALESCE(lp.progress_percentage, 0.0) AS progress_percentage,
+        COALESCE(lp.last_position_seconds, 0) AS last_position_seconds
+    FROM course_sections s
+    LEFT JOIN course_lessons l ON l.section_id = s.id
+    LEFT JOIN lesson_progress lp
+        ON lp.lesson_id = l.id AND lp.user_id = :user_id
+    WHERE s.course_id = :course_id
+    ORDER BY s.position, s.id, l.position
+""")
+
 class ProgressRepository:
     """
     Repository for progress-related database operations.
@@ -238,6 +260,135 @@ class ProgressRepository:
             logger.error(f"Error getting progress for user {user_id}: {str(e)}", exc_info=True)
             return []
     
+    async def get_section_lesson_progress(self, user_id: str, section_id: str) -> List[SectionLessonRow]:
+        """
+        Get the user's progress for every lesson in a section.
+        
+        Lessons without a progress record get not-started defaults, so the
+        rows can be returned to clients as they are.
+        
+        Args:
+            user_id: User ID
+            section_id: Section ID
+            
+        Returns:
+            List of lesson progress rows sorted by lesson position
+        """
+        try:
+            query = text("""
+            SELECT
+                l.id AS lesson_id,
+                l.title,
+                l.type,
+                COALESCE(lp.status, 'not_started') AS status,
+                COALESCE(lp.progress_percentage, 0.0) AS progress_percentage,
+                COALESCE(lp.last_position_seconds, 0) AS last_position_seconds
+            FROM course_lessons l
+            LEFT JOIN lesson_progress lp
+                ON lp.lesson_id = l.id AND lp.user_id = :user_id
+            WHERE l.section_id = :section_id
+            ORDER BY l.position
+            """)
+            
+            result = await self.db.execute(
+                query,
+                {"user_id": user_id, "section_id": section_id}
+            )
+            
+            return [SectionLessonRow(*row) for row in result]
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting lesson progress for user {user_id} and section {section_id}: {str(e)}", exc_info=True)
+            return []
+    
+    async def get_course_lesson_progress(self, user_id: str, course_id: str) -> List[CourseLessonRow]:
+        """
+        Get the user's progress for every lesson in a course.
+        
+        Rows carry their section's ID and title and are sorted by section
+        then lesson position. Sections without lessons yield a single row
+        whose lesson fields are None.
+        
+        Args:
+            user_id: User ID
+            course_id: Course ID
+            
+        Returns:
+            List of lesson progress rows
+        """
+        try:
+            result = await self.db.execute(
+                _COURSE_LESSON_PROGRESS_QUERY,
+                {"user_id": user_id, "course_id": course_id}
+            )
+            
+            return [CourseLessonRow(*row) for row in result]
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting lesson progress for user {user_id} and course {course_id}: {str(e)}", exc_info=True)
+            return []
+    
+    async def stream_course_lesson_progress(
+        self,
+        user_id: str,
+        course_id: str
+    ) -> AsyncIterator[CourseLessonRow]:
+        """
+        Stream the user's progress for every lesson in a course.
+        
+        Same rows and order as get_course_lesson_progress, read through a
+        server-side cursor instead of being buffered.
+        
+        Args:
+            user_id: User ID
+            course_id: Course ID
+            
+        Yields:
+            Lesson progress rows
+            
+        Raises:
+            SQLAlchemyError: If the query fails, even mid-stream; the error is
+                re-raised so a streamed response is aborted rather than
+                silently cut short
+        """
+        try:
+            result = await self.db.stream(
+                _COURSE_LESSON_PROGRESS_QUERY,
+                {"user_id": user_id, "course_id": course_id}
+            )
+            
+            async for row in result:
+                yield CourseLessonRow(*row)
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Error streaming lesson progress for user {user_id} and course {course_id}: {str(e)}", exc_info=True)
+            raise
+    
+    async def get_last_modified_for_user(self, user_id: str) -> Optional[datetime]:
+        """
+        Get the latest update time across a user's progress and enrollments.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Latest updated_at, or None if the user has no records
+        """
+        try:
+            query = text("""
+            SELECT GREATEST(
+                (SELECT MAX(updated_at) FROM lesson_progress WHERE user_id = :user_id),
+                (SELECT MAX(updated_at) FROM enrollments WHERE user_id = :user_id)
+            )
+            """)
+            
+            result = await self.db.execute(query, {"user_id": user_id})
+            return result.scalar()
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting last modified time for user {user_id}: {str(e)}", exc_info=True)
+            return None
+    
     async def calculate_course_progress(self, user_id: str, course_id: str) -> Tuple[float, Dict[str, int]]:
         """
         Calculate the overall progress for a user in a course.
@@ -1,10 +1,12 @@
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
+from itertools import groupby
+from operator import attrgetter
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.common.logger import get_logger
-from src.modules.courses.domain.progress import LessonProgress, ProgressStatus
+from src.modules.courses.domain.progress import CourseLessonRow, LessonProgress, ProgressStatus
 from src.modules.courses.persistence.progress_repository import ProgressRepository
 from src.modules.courses.persistence.enrollment_repository import EnrollmentRepository
 from src.modules.courses.persistence.lesson_repository import LessonRepository
@@ -179,6 +181,38 @@ class ProgressService:
         Returns:
             Dictionary containing course progress information
         """
+        try:
+            summary = await self.get_course_progress_summary(user_id, course_id)
+            if not summary:
+                return None
+            
+            # Every lesson with the user's progress, in one query
+            rows = await self.progress_repo.get_course_lesson_progress(user_id, course_id)
+            
+            summary["section_progress"] = [
+                self._section_progress_entry(section_id, section_title, section_rows)
+                for (section_id, section_title), section_rows in groupby(
+                    rows, key=attrgetter("section_id", "section_title")
+                )
+            ]
+            return summary
+            
+        except Exception as e:
+            logger.error(f"Error getting course progress: {str(e)}", exc_info=True)
+            return None
+    
+    async def get_course_progress_summary(self, user_id: str, course_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get course progress without the per-section breakdown.
+        
+        Args:
+            user_id: User ID
+            course_id: Course ID
+            
+        Returns:
+            Dictionary with the course, overall progress and enrollment, or
+            None if the course does not exist
+        """
         try:
             # Get course
             course = await self.course_repo.get_by_id(course_id)
@@ -190,62 +224,17 @@ class ProgressService:
                 user_id, course_id
             )
             
-            # Get sections with their progress
-            sections = await self.section_repo.get_by_course(course_id)
-            section_progress = []
-            
-            for section in sections:
-                # Get lessons in section
-                lessons = await self.lesson_repo.get_by_section(section.id)
-                lesson_progress = []
-                
-                for lesson in lessons:
-                    # Get progress for each lesson
-                    progress = await self.progress_repo.get_by_user_and_lesson(user_id, lesson.id)
-                    
-                    if not progress:
-                        progress = LessonProgress(
-                            user_id=user_id,
-                            lesson_id=lesson.id,
-                            status=ProgressStatus.NOT_STARTED,
-                            progress_percentage=0.0,
-                            last_position_seconds=0
-                        )
-                    
-                    lesson_progress.append({
-                        "lesson": {
-                            "id": lesson.id,
-                            "title": lesson.title,
-                            "type": lesson.type
-                        },
-                        "progress": progress.to_dict()
-                    })
-                
-                # Calculate section progress
-                section_progress_percentage = 0.0
-                if lessons:
-                    total_progress = sum(
-                        p["progress"]["progress_percentage"] 
-                        for p in lesson_progress
-                    )
-                    section_progress_percentage = total_progress / len(lessons)
-                
-                section_progress.append({
-                    "section": {
-                        "id": section.id,
-                        "title": section.title
-                    },
-                    "progress_percentage": section_progress_percentage,
-                    "lessons": lesson_progress
-                })
-            
             # Get enrollment status
-            enrollment = await self.course_repo.get_enrollment(user_id, course_id)
+            enrollment = await self.enrollment_repo.get_by_user_and_course(user_id, course_id)
             
             return {
+                "course": {
+                    "id": course.id,
+                    "title": course.title,
+                    "image_url": course.image_url
+                },
                 "overall_percentage": progress_percentage,
                 "status_counts": status_counts,
-                "section_progress": section_progress,
                 "enrollment": {
                     "status": enrollment.status if enrollment else "not_enrolled",
                     "progress_percentage": progress_percentage,
@@ -255,9 +244,60 @@ class ProgressService:
             }
             
         except Exception as e:
-            logger.error(f"Error getting course progress: {str(e)}", exc_info=True)
+            logger.error(f"Error getting course progress summary: {str(e)}", exc_info=True)
             return None
     
+    async def iter_section_progress(self, user_id: str, course_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield a course's section progress one section at a time.
+        
+        Rows are read from a server-side cursor, so each section is yielded
+        as soon as its last lesson arrives.
+        
+        Args:
+            user_id: User ID
+            course_id: Course ID
+            
+        Yields:
+            Section progress dictionaries in section order
+        """
+        section_key = None
+        section_rows: List[CourseLessonRow] = []
+        
+        async for row in self.progress_repo.stream_course_lesson_progress(user_id, course_id):
+            key = (row.section_id, row.section_title)
+            if key != section_key:
+                if section_key is not None:
+                    yield self._section_progress_entry(*section_key, section_rows)
+                section_key = key
+                section_rows = []
+            section_rows.append(row)
+        
+        if section_key is not None:
+            yield self._section_progress_entry(*section_key, section_rows)
+    
+    @staticmethod
+    def _section_progress_entry(
+        section_id: str,
+        section_title: str,
+        section_rows: Iterable[CourseLessonRow]
+    ) -> Dict[str, Any]:
+        """Build a section's progress entry from its lesson rows."""
+        lessons = [row for row in section_rows if row.lesson_id is not None]
+        
+        # Calculate section progress
+        section_progress_percentage = 0.0
+        if lessons:
+            total_progress = sum(row.progress_percentage for row in lessons)
+            section_progress_percentage = total_progress / len(lessons)
+        
+        return {
+            "section_id": section_id,
+            "title": section_title,
+            "progress_percentage": section_progress_percentage,
+            "lessons": lessons
+        }
+    
     async def get_section_progress(self, user_id: str, section_id: str) -> Dict[str, Any]:
         """
         Get progress for all lessons in a section.
@@ -279,30 +319,20 @@ class ProgressService:
                     "lessons": []
                 }
                 
-            # Get lessons in this section
-            lessons = await self.lesson_repo.get_lessons_by_section_id(section_id)
-            
-            lesson_progress = []
-            for lesson in lessons:
-                # Get progress for this lesson
-                progress = await self.progress_repo.get_by_user_and_lesson(user_id, lesson.id)
-                
-                lesson_progress.append({
-                    "lesson": lesson,
-                    "progress": progress
-                })
+            # Get every lesson in this section with the user's progress
+            lessons = await self.progress_repo.get_section_lesson_progress(user_id, section_id)
             
             # Calculate section progress percentage
             if not lessons:
                 section_percentage = 0.0
             else:
-                completed = sum(1 for lp in lesson_progress if lp["progress"] and lp["progress"].status == ProgressStatus.COMPLETED)
+                completed = sum(1 for lesson in lessons if lesson.status == ProgressStatus.COMPLETED.value)
                 section_percentage = (completed / len(lessons)) * 100.0
             
             return {
                 "section": section,
                 "progress_percentage": section_percentage,
-                "lessons": lesson_progress
+                "lessons": lessons
             }
             
         except Exception as e:
@@ -474,6 +504,24 @@ class ProgressService:
                 "last_activity_at": None
             }
     
+    async def get_learning_stats_last_modified(self, user_id: str) -> Optional[datetime]:
+        """
+        Get when a user's learning statistics last changed.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Latest update time of the user's lesson progress or enrollments,
+            or None if there is none
+        """
+        try:
+            return await self.progress_repo.get_last_modified_for_user(user_id)
+            
+        except Exception as e:
+            logger.error(f"Error getting learning stats last modified time: {str(e)}", exc_info=True)
+            return None
+    
     async def _update_course_progress(self, user_id: str, lesson_id: str) -> None:
         """
         Helper method to update course progress after lesson progress change.
@@ -5,6 +5,7 @@ import uuid
 from sqlalchemy import select, update, insert, delete, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import raiseload, selectinload
 
 from src.common.logger import get_logger
 from src.modules.identity.domain.profile import UserProfile
@@ -33,7 +34,9 @@ class ProfileRepository:
             User profile domain entity if found, None otherwise
         """
         try:
-            query = select(UserProfileModel).where(UserProfileModel.user_id == user_id)
+            query = select(UserProfileModel).where(
+                UserProfileModel.user_id == user_id
+            ).options(raiseload("*"))
             result = await self.db.execute(query)
             profile_model = result.scalars().first()
             
@@ -139,6 +142,43 @@ class ProfileRepository:
             logger.error(f"Error getting roles for user {user_id}: {str(e)}", exc_info=True)
             return []
     
+    async def get_roles_for_user(self, user_id: str) -> List[Role]:
+        """
+        Get the role entities assigned to a user.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            List of role domain entities (without permissions)
+            
+        Raises:
+            SQLAlchemyError: If the roles cannot be read; callers cache the
+                result, so a failure must not look like "no roles"
+        """
+        try:
+            query = select(RoleModel).join(
+                UserRoleModel, UserRoleModel.role_id == RoleModel.id
+            ).where(
+                UserRoleModel.user_id == user_id
+            ).options(raiseload("*"))
+            
+            result = await self.db.execute(query)
+            
+            return [
+                Role(
+                    id=role_model.id,
+                    code=role_model.code,
+                    name=role_model.name,
+                    description=role_model.description
+                )
+                for role_model in result.scalars().all()
+            ]
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting role entities for user {user_id}: {str(e)}", exc_info=True)
+            raise
+    
     async def get_user_permissions(self, user_id: str) -> Dict[str, Any]:
         """
         Get a user's permissions including those from their roles.
@@ -148,6 +188,10 @@ class ProfileRepository:
             
         Returns:
             Dictionary with roles and permissions
+            
+        Raises:
+            SQLAlchemyError: If the permissions cannot be read; callers cache
+                the result, so a failure must not look like "no permissions"
         """
         try:
             # Get user roles
@@ -182,7 +226,7 @@ class ProfileRepository:
             
         except SQLAlchemyError as e:
             logger.error(f"Error getting permissions for user {user_id}: {str(e)}", exc_info=True)
-            return {"roles": [], "permissions": []}
+            raise
     
     async def assign_role_to_user(self, user_id: str, role_code: str) -> bool:
         """
@@ -281,22 +325,17 @@ class ProfileRepository:
             List of role domain entities
         """
         try:
-            query = select(RoleModel)
+            # Load every role's permissions in one batched IN-query instead
+            # of one query per role; any other relationship access raises
+            query = select(RoleModel).options(
+                selectinload(RoleModel.permissions),
+                raiseload("*")
+            )
             result = await self.db.execute(query)
             role_models = result.scalars().all()
             
             roles = []
             for role_model in role_models:
-                # Get permissions for this role
-                perm_query = select(PermissionModel).join(
-                    RolePermissionModel, RolePermissionModel.permission_id == PermissionModel.id
-                ).where(
-                    RolePermissionModel.role_id == role_model.id
-                )
-                
-                perm_result = await self.db.execute(perm_query)
-                perm_models = perm_result.scalars().all()
-                
                 permissions = [
                     Permission(
                         id=perm.id,
@@ -304,7 +343,7 @@ class ProfileRepository:
                         name=perm.name,
                         description=perm.description
                     )
-                    for perm in perm_models
+                    for perm in role_model.permissions
                 ]
                 
                 roles.append(Role(
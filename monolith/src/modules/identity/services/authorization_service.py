@@ -0,0 +1,163 @@
+from typing import Dict, FrozenSet, List, Tuple
+
+import orjson
+from cachetools import TTLCache
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.common.cache import get_cache
+from src.common.logger import get_logger
+from src.modules.identity.domain.role import Role
+from src.modules.identity.persistence.profile_repository import ProfileRepository
+
+logger = get_logger(__name__)
+
+# Two-tier cache of each user's role and permission codes: an in-process TTL
+# cache (L1) in front of Redis (L2), so permission checks on hot paths do not
+# hit the database. Entries are dropped on role changes; the short L1 TTL
+# bounds staleness in other worker processes. Database errors are never
+# cached: the user is treated as having no access for that one call only.
+_ACCESS_L1_TTL_SECONDS = 60
+_ACCESS_L2_TTL_SECONDS = 300
+_ACCESS_KEY_PREFIX = "auth:perm:"
+
+AccessSnapshot = Tuple[FrozenSet[str], FrozenSet[str]]
+
+_access_cache: TTLCache = TTLCache(maxsize=50_000, ttl=_ACCESS_L1_TTL_SECONDS)
+_user_roles_cache: TTLCache = TTLCache(maxsize=50_000, ttl=_ACCESS_L1_TTL_SECONDS)
+
+class AuthorizationService:
+    """
+    Service for role and permission checks.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.profile_repository = ProfileRepository(db)
+
+    async def check_permission(self, user_id: str, permission_code: str) -> bool:
+        """
+        Check whether a user has a permission.
+
+        Users with the admin role implicitly have every permission.
+
+        Args:
+            user_id: User ID
+            permission_code: Permission code (e.g. "identity.view_profile")
+
+        Returns:
+            True if the user has the permission, False otherwise
+        """
+        roles, permissions = await self.get_access(user_id)
+        return "admin" in roles or permission_code in permissions
+
+    async def get_user_roles(self, user_id: str) -> List[Role]:
+        """
+        Get the roles assigned to a user.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            List of role domain entities
+        """
+        roles = _user_roles_cache.get(user_id)
+        if roles is None:
+            try:
+                roles = await self.profile_repository.get_roles_for_user(user_id)
+            except SQLAlchemyError:
+                return []
+            _user_roles_cache[user_id] = roles
+        return roles
+
+    async def get_all_roles(self) -> List[Role]:
+        """
+        Get all roles with their permissions.
+
+        Returns:
+            List of role domain entities
+        """
+        return await self.profile_repository.get_all_roles()
+
+    async def assign_role_to_user(self, user_id: str, role_code: str) -> bool:
+        """
+        Assign a role to a user.
+
+        Args:
+            user_id: User ID
+            role_code: Role code
+
+        Returns:
+            True if assigned successfully, False otherwise
+        """
+        success = await self.profile_repository.assign_role_to_user(user_id, role_code)
+        if success:
+            await self._invalidate_user(user_id)
+        return success
+
+    async def remove_role_from_user(self, user_id: str, role_code: str) -> bool:
+        """
+        Remove a role from a user.
+
+        Args:
+            user_id: User ID
+            role_code: Role code
+
+        Returns:
+            True if removed successfully, False otherwise
+        """
+        success = await self.profile_repository.remove_role_from_user(user_id, role_code)
+        if success:
+            await self._invalidate_user(user_id)
+        return success
+
+    async def get_access(self, user_id: str) -> AccessSnapshot:
+        """
+        Get a user's role and permission codes through the L1/L2 caches.
+
+        Redis failures are logged and treated as cache misses. If the
+        database lookup fails, no roles or permissions are returned and
+        nothing is cached.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Tuple of (role codes, permission codes) as frozensets
+        """
+        access = _access_cache.get(user_id)
+        if access is not None:
+            return access
+
+        key = f"{_ACCESS_KEY_PREFIX}{user_id}"
+        cached = None
+        try:
+            cached = await get_cache().get(key)
+        except RedisError as e:
+            logger.warning(f"Permission cache read failed for user {user_id}: {str(e)}")
+
+        if cached is not None:
+            data: Dict[str, List[str]] = orjson.loads(cached)
+        else:
+            try:
+                data = await self.profile_repository.get_user_permissions(user_id)
+            except SQLAlchemyError:
+                return frozenset(), frozenset()
+            try:
+                await get_cache().setex(key, _ACCESS_L2_TTL_SECONDS, orjson.dumps(data))
+            except RedisError as e:
+                logger.warning(f"Permission cache write failed for user {user_id}: {str(e)}")
+
+        access = (frozenset(data.get("roles", [])), frozenset(data.get("permissions", [])))
+        _access_cache[user_id] = access
+        return access
+
+    async def _invalidate_user(self, user_id: str) -> None:
+        """Drop cached roles and permissions for a user after a role change."""
+        _access_cache.pop(user_id, None)
+        _user_roles_cache.pop(user_id, None)
+        try:
+            await get_cache().delete(f"{_ACCESS_KEY_PREFIX}{user_id}")
+        except RedisError as e:
+            logger.warning(f"Permission cache invalidation failed for user {user_id}: {str(e)}")
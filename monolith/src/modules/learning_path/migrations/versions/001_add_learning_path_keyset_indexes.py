@@ -0,0 +1,35 @@
+"""add learning path keyset pagination indexes
+
+Revision ID: lp_001
+Revises:
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'lp_001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Keyset pagination index matching ORDER BY created_at DESC, id DESC
+    op.create_index(
+        'idx_learning_paths_published_created_id',
+        'learning_paths',
+        ['is_published', sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+
+    # Partial variant for non-admin listings, which only see published paths
+    op.create_index(
+        'idx_learning_paths_created_id_published',
+        'learning_paths',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        postgresql_where=sa.text('is_published = true')
+    )
+
+def downgrade():
+    op.drop_index('idx_learning_paths_created_id_published', table_name='learning_paths')
+    op.drop_index('idx_learning_paths_published_created_id', table_name='learning_paths')
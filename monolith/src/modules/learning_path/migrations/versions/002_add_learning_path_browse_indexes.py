@@ -0,0 +1,36 @@
+"""add learning path public browsing indexes
+
+Revision ID: lp_002
+Revises: lp_001
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'lp_002'
+down_revision = 'lp_001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Featured listings for non-admins (featured_only=true, published_only=true)
+    op.create_index(
+        'ix_lp_pub_feat',
+        'learning_paths',
+        ['category', 'difficulty_level', sa.text('created_at DESC')],
+        postgresql_where=sa.text('is_published = true AND is_featured = true')
+    )
+
+    # Category/difficulty filters over all published paths
+    op.create_index(
+        'ix_lp_pub_category_difficulty',
+        'learning_paths',
+        ['category', 'difficulty_level', sa.text('created_at DESC')],
+        postgresql_where=sa.text('is_published = true')
+    )
+
+def downgrade():
+    op.drop_index('ix_lp_pub_category_difficulty', table_name='learning_paths')
+    op.drop_index('ix_lp_pub_feat', table_name='learning_paths')
@@ -0,0 +1,35 @@
+"""add notification feed index
+
+Revision ID: notif_001
+Revises:
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'notif_001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Serves the per-user feed (optionally filtered by is_read) newest first,
+    # including keyset pages on created_at, without touching the heap
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notif_user_read_ct',
+            'notifications',
+            ['user_id', 'is_read', sa.text('created_at DESC')],
+            postgresql_include=['id', 'title', 'type'],
+            postgresql_concurrently=True
+        )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_notif_user_read_ct',
+            table_name='notifications',
+            postgresql_concurrently=True
+        )
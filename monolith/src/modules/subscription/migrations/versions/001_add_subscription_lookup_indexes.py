@@ -0,0 +1,42 @@
+"""add subscription lookup indexes
+
+Revision ID: sub_001
+Revises:
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'sub_001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # The hot queries filter on (user_id, status = 'active') and page history
+    # by start date; neither filters or sorts on end_date, so instead of one
+    # (user_id, status, end_date) index each gets an index shaped to it
+    with op.get_context().autocommit_block():
+        # Active subscription lookup; each user has at most a few active rows
+        op.create_index(
+            'ix_sub_user_status',
+            'subscriptions',
+            ['user_id', 'status'],
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True
+        )
+
+        # Subscription history, newest first
+        op.create_index(
+            'ix_sub_user_started',
+            'subscriptions',
+            ['user_id', sa.text('start_date DESC')],
+            postgresql_concurrently=True
+        )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_sub_user_started', table_name='subscriptions', postgresql_concurrently=True)
+        op.drop_index('ix_sub_user_status', table_name='subscriptions', postgresql_concurrently=True)
@@ -0,0 +1,34 @@
+"""add user progress item index
+
+Revision ID: progress_001
+Revises:
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'progress_001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Item progress lookups. Not unique: existing duplicate rows would fail a
+    # concurrent unique build and leave an INVALID index behind, so uniqueness
+    # waits for a migration that deduplicates first
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_progress_user_item',
+            'user_progress',
+            ['user_id', 'item_type', 'item_id'],
+            postgresql_concurrently=True
+        )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_progress_user_item',
+            table_name='user_progress',
+            postgresql_concurrently=True
+        )
@@ -154,7 +154,23 @@ class TestProgressAPI:
         mock_services["progress_service"].update_lesson_progress.assert_called_once_with(
             "test-user-id", "test-lesson-id", 60.0, 400
         )
-    
+
+    def test_update_lesson_progress_invalidates_learning_stats(self, client, override_dependencies, sample_lesson_progress):
+        # Setup mock
+        mock_services = override_dependencies
+        mock_services["progress_service"].update_lesson_progress.return_value = sample_lesson_progress
+
+        # Make request
+        with patch("src.api.v1.routers.progress.invalidate_cache", AsyncMock()) as invalidate_cache:
+            response = client.post(
+                "/progress/lesson/test-lesson-id/update",
+                json={"progress_percentage": 60.0, "position_seconds": 400}
+            )
+
+        # The cached stats body must not outlive the change
+        assert response.status_code == 200
+        invalidate_cache.assert_awaited_once_with("learningstats:test-user-id")
+
     def test_complete_lesson(self, client, override_dependencies, sample_lesson_progress):
         # Setup mock
         mock_services = override_dependencies
@@ -263,12 +279,14 @@ class TestProgressAPI:
         # Setup mock
         mock_services = override_dependencies
         mock_services["progress_service"].get_learning_stats.return_value = sample_learning_stats
+        mock_services["progress_service"].get_learning_stats_last_modified.return_value = datetime(2023, 1, 1, 12, 0, 0)
         
         # Make request
         response = client.get("/progress/learning-stats")
         
         # Check response
         assert response.status_code == 200
+        assert response.headers["Last-Modified"] == "Sun, 01 Jan 2023 12:00:00 GMT"
         data = response.json()
         assert data["enrolled_courses"] == 5
         assert data["completed_courses"] == 2
@@ -278,4 +296,23 @@ class TestProgressAPI:
         assert data["minutes_watched"] == 540
         
         # Verify mock called
-        mock_services["progress_service"].get_learning_stats.assert_called_once_with("test-user-id") 
\ No newline at end of file
+        mock_services["progress_service"].get_learning_stats.assert_called_once_with("test-user-id")
+    
+    def test_get_learning_stats_if_none_match_overrides_if_modified_since(self, client, override_dependencies, sample_learning_stats):
+        # Setup mock
+        mock_services = override_dependencies
+        mock_services["progress_service"].get_learning_stats.return_value = sample_learning_stats
+        mock_services["progress_service"].get_learning_stats_last_modified.return_value = datetime(2023, 1, 1, 12, 0, 0)
+        
+        # Date alone would match, but a stale ETag must still get the body
+        response = client.get(
+            "/progress/learning-stats",
+            headers={
+                "If-Modified-Since": "Sun, 01 Jan 2023 12:00:00 GMT",
+                "If-None-Match": '"stale-etag"'
+            }
+        )
+        
+        # Check response
+        assert response.status_code == 200
+        assert response.json()["enrolled_courses"] == 5
\ No newline at end of file
@@ -0,0 +1,142 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.responses import Response
+
+from src.common import cache
+from src.common.cache import cached_response
+
+CACHE_KEY = "test:key"
+
+@pytest.fixture
+def redis_calls():
+    """Replace the Redis helpers: every lookup misses and every lock is granted."""
+    with patch.object(cache, "get_cached", AsyncMock(return_value=None)) as get_cached, \
+         patch.object(cache, "set_cached", AsyncMock()) as set_cached, \
+         patch.object(cache, "invalidate_cache", AsyncMock()) as invalidate_cache, \
+         patch.object(cache, "_acquire_fill_lock", AsyncMock(return_value=True)) as acquire_fill_lock:
+        yield {
+            "get_cached": get_cached,
+            "set_cached": set_cached,
+            "invalidate_cache": invalidate_cache,
+            "acquire_fill_lock": acquire_fill_lock,
+        }
+    cache._inflight_fills.clear()
+
+@pytest.fixture
+def request_without_validators():
+    request = MagicMock()
+    request.headers = {}
+    return request
+
+def make_handler(release: asyncio.Event, fail_first: bool = False):
+    """Build a cached handler that blocks until released and counts its calls."""
+    calls = {"count": 0}
+
+    @cached_response(ttl=60, key=lambda **_: CACHE_KEY)
+    async def handler(request):
+        calls["count"] += 1
+        await release.wait()
+        if fail_first and calls["count"] == 1:
+            raise RuntimeError("fill failed")
+        return {"value": calls["count"]}
+
+    return handler, calls
+
+async def wait_for_fill():
+    """Yield to the event loop until a fill for CACHE_KEY is in progress."""
+    for _ in range(100):
+        if CACHE_KEY in cache._inflight_fills:
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("fill never started")
+
+class TestInflightFills:
+    """Tests for the in-process single-flight path of cached_response."""
+
+    @pytest.mark.asyncio
+    async def test_waiter_shares_successful_fill(self, redis_calls, request_without_validators):
+        release = asyncio.Event()
+        handler, calls = make_handler(release)
+
+        leader = asyncio.create_task(handler(request=request_without_validators))
+        await wait_for_fill()
+        waiter = asyncio.create_task(handler(request=request_without_validators))
+        await asyncio.sleep(0)
+        release.set()
+
+        leader_response, waiter_response = await asyncio.gather(leader, waiter)
+
+        assert calls["count"] == 1
+        assert leader_response.body == waiter_response.body == b'{"value":1}'
+        assert leader_response.headers["ETag"] == waiter_response.headers["ETag"]
+        # The waiter never went to Redis for the fill lock
+        redis_calls["acquire_fill_lock"].assert_awaited_once_with(CACHE_KEY)
+        redis_calls["set_cached"].assert_awaited_once()
+        assert CACHE_KEY not in cache._inflight_fills
+
+    @pytest.mark.asyncio
+    async def test_failed_fill_resolves_waiters_to_none(self, redis_calls, request_without_validators):
+        release = asyncio.Event()
+        handler, calls = make_handler(release, fail_first=True)
+
+        leader = asyncio.create_task(handler(request=request_without_validators))
+        await wait_for_fill()
+        fill = cache._inflight_fills[CACHE_KEY]
+        waiter = asyncio.create_task(handler(request=request_without_validators))
+        await asyncio.sleep(0)
+        release.set()
+
+        with pytest.raises(RuntimeError):
+            await leader
+        waiter_response = await waiter
+
+        # The shared fill resolved to None, so the waiter filled the entry itself
+        assert fill.result() is None
+        assert calls["count"] == 2
+        assert waiter_response.body == b'{"value":2}'
+        # The failed fill released its lock
+        redis_calls["invalidate_cache"].assert_any_await(f"{CACHE_KEY}:lock")
+        assert CACHE_KEY not in cache._inflight_fills
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_fill(self, redis_calls, request_without_validators):
+        release = asyncio.Event()
+        handler, calls = make_handler(release)
+
+        leader = asyncio.create_task(handler(request=request_without_validators))
+        await wait_for_fill()
+        fill = cache._inflight_fills[CACHE_KEY]
+        waiter = asyncio.create_task(handler(request=request_without_validators))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert not fill.cancelled()
+
+        release.set()
+        leader_response = await leader
+
+        assert calls["count"] == 1
+        assert leader_response.body == b'{"value":1}'
+        assert fill.result() == b'{"value":1}'
+
+    @pytest.mark.asyncio
+    async def test_response_result_is_not_cached(self, redis_calls, request_without_validators):
+        uncached = Response(content=b'{"partial":true}', media_type="application/json")
+
+        @cached_response(ttl=60, key=lambda **_: CACHE_KEY, cache_control="private, max-age=60")
+        async def handler(request):
+            return uncached
+
+        response = await handler(request=request_without_validators)
+
+        # Sent as is, without an ETag or the cached Cache-Control
+        assert response is uncached
+        assert "ETag" not in response.headers
+        assert "Cache-Control" not in response.headers
+        redis_calls["set_cached"].assert_not_awaited()
+        redis_calls["invalidate_cache"].assert_awaited_once_with(f"{CACHE_KEY}:lock")
+        assert CACHE_KEY not in cache._inflight_fills
@@ -2,7 +2,7 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from src.modules.courses.domain.progress import LessonProgress, ProgressStatus
+from src.modules.courses.domain.progress import CourseLessonRow, LessonProgress, ProgressStatus
 from src.modules.courses.services.progress_service import ProgressService
 from src.modules.courses.persistence.progress_repository import ProgressRepository
 
@@ -270,16 +270,21 @@ class TestProgressService:
         progress_service.progress_repo.calculate_course_progress = AsyncMock(
             return_value=(35.0, {"not_started": 5, "in_progress": 3, "completed": 2})
         )
-        progress_service.section_repo.get_by_course = AsyncMock(
-            return_value=[sample_section]
+        progress_service.progress_repo.get_course_lesson_progress = AsyncMock(
+            return_value=[
+                CourseLessonRow(
+                    section_id=sample_section.id,
+                    section_title=sample_section.title,
+                    lesson_id=sample_lesson.id,
+                    title=sample_lesson.title,
+                    type=sample_lesson.type,
+                    status=sample_lesson_progress.status.value,
+                    progress_percentage=sample_lesson_progress.progress_percentage,
+                    last_position_seconds=sample_lesson_progress.last_position_seconds
+                )
+            ]
         )
-        progress_service.lesson_repo.get_by_section = AsyncMock(
-            return_value=[sample_lesson]
-        )
-        progress_service.progress_repo.get_by_user_and_lesson = AsyncMock(
-            return_value=sample_lesson_progress
-        )
-        progress_service.course_repo.get_enrollment = AsyncMock(
+        progress_service.enrollment_repo.get_by_user_and_course = AsyncMock(
             return_value=MagicMock(
                 status="active",
                 progress_percentage=35.0,
@@ -298,6 +303,7 @@ class TestProgressService:
         assert len(result["section_progress"]) == 1
         assert result["overall_percentage"] == 35.0
         assert result["status_counts"] == {"not_started": 5, "in_progress": 3, "completed": 2}
+        assert result["section_progress"][0]["progress_percentage"] == 45.5
         
     @pytest.mark.asyncio
     async def test_get_learning_stats(self, progress_service, mock_db):